@@ -1,7 +1,7 @@
-import requests
-from datetime import datetime, timedelta
 import logging
-import pytz
+from .game_state import get_game_state
+from .player_stats import player_stats
+from .season import season_schedules
 
 logger = logging.getLogger("baseball")
 logger.setLevel(logging.DEBUG)
@@ -80,132 +80,54 @@ def get_team_info(team_id):
     return MLB_TEAMS.get(team_id, {"name": f"Team {team_id}", "color": (15, 15, 15)})
 
 
-def get_team_id_by_name(name):
-    res = requests.get(f"{BASE_URL}/teams?sportId=1")
-    teams = res.json().get("teams", [])
-    for team in teams:
-        team_name = team["name"].lower()
-        team_team_name = team["teamName"].lower()
-        search_name = name.lower()
+async def get_last_game(team_id):
+    return await season_schedules.last_game(team_id)
 
-        # Exact match first
-        if search_name == team_name or search_name == team_team_name:
-            return team["id"]
 
-        # Check if search name is contained in team name or vice versa
-        if (
-            search_name in team_name
-            or team_name in search_name
-            or search_name in team_team_name
-            or team_team_name in search_name
-        ):
-            return team["id"]
-    return None
+async def get_next_game(team_id):
+    return await season_schedules.next_game(team_id)
 
 
-def get_last_game(team_id):
-    now = datetime.today()
-    today = now.strftime("%Y-%m-%d")
+async def get_live_game(team_id):
+    game = await season_schedules.live_game(team_id)
+    if game:
+        logger.warning(f"Found live game: gamePk={game.get('gamePk')}")
+    else:
+        logger.warning(f"No live game found for team ID {team_id}.")
+    return game
 
-    # Dynamic season detection
-    current_year = now.year
-    if now.month <= 2:  # Jan-Feb: use previous year (off-season)
-        season_start = f"{current_year - 1}-03-01"
-    else:  # Mar-Dec: use current year
-        season_start = f"{current_year}-03-01"
 
-    res = requests.get(
-        f"{BASE_URL}/schedule?sportId=1&teamId={team_id}&startDate={season_start}&endDate={today}&limit=100"
-    )
-    for date in reversed(res.json().get("dates", [])):
-        for game in date["games"]:
-            if game["status"]["detailedState"] == "Final":
-                return game
-    return None
-
-
-def get_next_game(team_id):
-    now = datetime.today()
-    tomorrow = (now + timedelta(days=1)).strftime("%Y-%m-%d")
-
-    # Search up to 30 days ahead to find next scheduled game
-    end_search = (now + timedelta(days=30)).strftime("%Y-%m-%d")
-
-    res = requests.get(
-        f"{BASE_URL}/schedule?sportId=1&teamId={team_id}&startDate={tomorrow}&endDate={end_search}&limit=20"
-    )
-    for date in res.json().get("dates", []):
-        for game in date["games"]:
-            if game["status"]["detailedState"] == "Scheduled":
-                return game
-    return None
-
-
-def get_live_game(team_id):
-    pacific = pytz.timezone("US/Pacific")
-    today = datetime.now(pacific).strftime("%Y-%m-%d")
-    logger.warning(f"Fetching schedule for {today} and team ID {team_id}")
-    res = requests.get(
-        f"{BASE_URL}/schedule?sportId=1&teamId={team_id}&startDate={today}&endDate={today}"
-    )
-    logger.warning(f"Schedule response: {res.status_code}")
-    schedule = res.json()
-    logger.warning(f"Schedule data: {schedule}")
-
-    for date in schedule.get("dates", []):
-        for game in date.get("games", []):
-            status = game.get("status", {})
-            logger.warning(f"Checking gamePk={game.get('gamePk')}, status={status}")
-            if status.get("abstractGameState") in ["Live", "In Progress"]:
-                logger.warning(f"Found live game: {game}")
-                return game
-
-    logger.warning("No live game found.")
-    return None
-
-
-def get_live_game_details(team_id):
+async def get_live_game_details(team_id):
     logger.warning(f"Getting live game details for team ID: {team_id}")
-    game = get_live_game(team_id)
+    game = await get_live_game(team_id)
     if not game:
         logger.warning("No live game returned from get_live_game")
         return None
 
     gamePk = game.get("gamePk")
     logger.warning(f"Fetching live data for gamePk: {gamePk}")
-    res = requests.get(f"https://statsapi.mlb.com/api/v1.1/game/{gamePk}/feed/live")
-    logger.warning(f"Feed response status: {res.status_code}")
-
-    if res.status_code != 200:
-        logger.warning(f"API returned status {res.status_code}")
-        return None
-
-    try:
-        data = res.json()
-    except Exception as e:
-        logger.warning(f"Failed to parse JSON response: {e}")
-        logger.warning(f"Response content: {res.text[:200]}...")
-        return None
-
-    latest_play = data["liveData"]["plays"]["allPlays"][-1]
+    state = get_game_state(gamePk)
+    # Feed errors propagate so the poller keeps serving its last payload
+    data = await state.refresh()
+
+    all_plays = data["liveData"]["plays"]["allPlays"]
+    cursor = state.cursor
+    for play in cursor.advance(all_plays):
+        # A finished plate appearance is the only thing that moves an average
+        player_stats.invalidate(play["matchup"]["batter"]["id"])
+    await player_stats.prefetch_game(gamePk, data)
+
+    latest_play = all_plays[-1]
     batter_info = latest_play["matchup"]["batter"]
     pitcher = latest_play["matchup"]["pitcher"]["fullName"]
     batter = batter_info["fullName"]
     batter_id = batter_info["id"]
 
-    pitch = None
-    for play in reversed(data["liveData"]["plays"]["allPlays"]):
-        for event in reversed(play.get("playEvents", [])):
-            if event.get("type") == "pitch" and "pitchData" in event:
-                pitch = event
-                latest_play = play
-                break
-        if pitch:
-            break
-
+    pitch = cursor.latest_pitch
     if not pitch:
         logger.warning("No pitch data found in any plays")
         return None
+    latest_play = cursor.latest_pitch_play
 
     home_team = data["gameData"]["teams"]["home"]["name"]
     away_team = data["gameData"]["teams"]["away"]["name"]
@@ -226,46 +148,9 @@ def get_live_game_details(team_id):
     inning = latest_play["about"]["inning"]
     half_inning = "Top" if latest_play["about"]["isTopInning"] else "Bottom"
 
-    player_res = requests.get(
-        f"https://statsapi.mlb.com/api/v1/people/{batter_id}?hydrate=stats(group=[hitting],type=[season])"
-    )
-    batter_data = player_res.json()
-    batting_avg = (
-        batter_data["people"][0]
-        .get("stats", [{}])[0]
-        .get("splits", [{}])[0]
-        .get("stat", {})
-        .get("avg", "N/A")
-    )
-
-    at_bats = 0
-    hits = 0
-    last_result = ""
-    for play in data["liveData"]["plays"]["allPlays"]:
-        matchup = play.get("matchup", {})
-        result = play.get("result", {})
-        if matchup.get("batter", {}).get("id") != batter_id:
-            continue
-        event_type = result.get("eventType", "")
-        event = result.get("event", "")
-        if event_type in [
-            "single",
-            "double",
-            "triple",
-            "home_run",
-            "field_out",
-            "grounded_into_double_play",
-            "force_out",
-            "strikeout",
-        ]:
-            at_bats += 1
-            last_result = event
-        if event_type in ["single", "double", "triple", "home_run"]:
-            hits += 1
+    batting_avg = await player_stats.batting_avg(batter_id)
 
-    todays_line = f"{hits}-for-{at_bats}"
-    if last_result:
-        todays_line += f", {last_result.lower()}"
+    todays_line = cursor.batter_line(batter_id)
 
     coords = pitch["pitchData"]["coordinates"]
     x = coords["pX"]
@@ -0,0 +1,282 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from ..constants import CACHE_TTLS, GAME_STATE_IDLE_TIMEOUT, CacheTier
+from ..selection import Selection, pointer_prefix
+from ..upstream import upstream
+from .play_cursor import PlayCursor
+from .player_stats import player_stats
+
+logger = logging.getLogger("baseball")
+
+FEED_URL = "https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
+DIFF_PATCH_URL = FEED_URL + "/diffPatch?startTimecode={timecode}"
+
+# The parts of feed/live read by the state engine, play cursor, lineup
+# prefetch and live details payload; everything else is never built
+FEED_SELECTION = Selection(
+    [
+        "metaData.timeStamp",
+        "gameData.status",
+        "gameData.teams.home.id",
+        "gameData.teams.home.name",
+        "gameData.teams.away.id",
+        "gameData.teams.away.name",
+        "liveData.plays.allPlays.item.about",
+        "liveData.plays.allPlays.item.count",
+        "liveData.plays.allPlays.item.matchup.batter",
+        "liveData.plays.allPlays.item.matchup.pitcher",
+        "liveData.plays.allPlays.item.result",
+        "liveData.plays.allPlays.item.playEvents.item.type",
+        "liveData.plays.allPlays.item.playEvents.item.details",
+        "liveData.plays.allPlays.item.playEvents.item.pitchData",
+        "liveData.linescore.teams",
+        "liveData.boxscore.teams.home.battingOrder",
+        "liveData.boxscore.teams.home.batters",
+        "liveData.boxscore.teams.away.battingOrder",
+        "liveData.boxscore.teams.away.batters",
+    ]
+)
+
+
+class PatchError(Exception):
+    pass
+
+
+def _parse_pointer(path: str) -> List[str]:
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise PatchError(f"Invalid JSON pointer: {path}")
+    return [p.replace("~1", "/").replace("~0", "~") for p in path[1:].split("/")]
+
+
+def _index(container: list, token: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    try:
+        index = int(token)
+    except ValueError:
+        raise PatchError(f"Invalid array index: {token}")
+    limit = len(container) + (1 if allow_end else 0)
+    if not 0 <= index < limit:
+        raise PatchError(f"Array index out of range: {token}")
+    return index
+
+
+def _walk(doc: Any, tokens: List[str]) -> Any:
+    for token in tokens:
+        try:
+            doc = doc[_index(doc, token)] if isinstance(doc, list) else doc[token]
+        except (KeyError, TypeError):
+            raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+    return doc
+
+
+def _get(doc: Any, path: str) -> Any:
+    return _walk(doc, _parse_pointer(path))
+
+
+def _add(doc: Any, path: str, value: Any) -> Any:
+    tokens = _parse_pointer(path)
+    if not tokens:
+        return value
+    parent = _walk(doc, tokens[:-1])
+    if isinstance(parent, list):
+        parent.insert(_index(parent, tokens[-1], allow_end=True), value)
+    elif isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    else:
+        raise PatchError(f"Cannot add to {path}")
+    return doc
+
+
+def _remove(doc: Any, path: str) -> Any:
+    tokens = _parse_pointer(path)
+    if not tokens:
+        raise PatchError("Cannot remove the document root")
+    parent = _walk(doc, tokens[:-1])
+    try:
+        if isinstance(parent, list):
+            del parent[_index(parent, tokens[-1])]
+        else:
+            del parent[tokens[-1]]
+    except (KeyError, TypeError):
+        raise PatchError(f"Path not found: {path}")
+    return doc
+
+
+def _replace(doc: Any, path: str, value: Any) -> Any:
+    tokens = _parse_pointer(path)
+    if not tokens:
+        return value
+    parent = _walk(doc, tokens[:-1])
+    if isinstance(parent, list):
+        parent[_index(parent, tokens[-1])] = value
+    elif isinstance(parent, dict) and tokens[-1] in parent:
+        parent[tokens[-1]] = value
+    else:
+        raise PatchError(f"Path not found: {path}")
+    return doc
+
+
+def apply_patch(doc: Any, operations: List[Dict[str, Any]]) -> Any:
+    """Apply RFC 6902 JSON Patch operations to doc in place.
+
+    Returns the patched document (a new object only when the root itself is
+    replaced). Raises PatchError if an operation doesn't fit the document.
+    """
+    for op in operations:
+        kind = op.get("op")
+        path = op.get("path", "")
+        if kind == "add":
+            doc = _add(doc, path, op.get("value"))
+        elif kind == "remove":
+            doc = _remove(doc, path)
+        elif kind == "replace":
+            doc = _replace(doc, path, op.get("value"))
+        elif kind == "move":
+            value = _get(doc, op["from"])
+            doc = _add(_remove(doc, op["from"]), path, value)
+        elif kind == "copy":
+            doc = _add(doc, path, _get(doc, op["from"]))
+        elif kind == "test":
+            if _get(doc, path) != op.get("value"):
+                raise PatchError(f"Test failed at {path}")
+        else:
+            raise PatchError(f"Unknown patch operation: {kind}")
+    return doc
+
+
+def select_patch(
+    selection: Selection, operations: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Restrict patch operations to a document trimmed to selection.
+
+    Operations entirely outside the selection are dropped and values
+    written above a selected path are trimmed the same way the document
+    was. A move or copy is kept when both ends are trimmed the same way;
+    one that crosses the selection boundary can't be replayed on the
+    trimmed copy and raises PatchError.
+    """
+    selected = []
+    for op in operations:
+        prefix = pointer_prefix(op.get("path", ""))
+        if prefix is None:
+            raise PatchError(f"Invalid JSON pointer: {op.get('path')}")
+        inside = selection.contains(prefix)
+        above = not inside and selection.is_ancestor(prefix)
+        if op.get("op") in ("move", "copy"):
+            source = pointer_prefix(op.get("from", ""))
+            if source is None:
+                raise PatchError(f"Invalid JSON pointer: {op.get('from')}")
+            source_kept = selection.contains(source) or selection.is_ancestor(source)
+            if (inside and selection.contains(source)) or (above and source == prefix):
+                # Both ends are trimmed alike, so the trimmed value moves as-is
+                selected.append(op)
+            elif inside or above or source_kept:
+                raise PatchError(f"Cannot {op['op']} across the selection")
+            continue
+        if inside:
+            selected.append(op)
+        elif above:
+            if "value" in op:
+                op = dict(op, value=selection.project(op["value"], prefix))
+            selected.append(op)
+    return selected
+
+
+class LiveGameState:
+    """In-memory copy of one game's live feed, kept current with diffPatch.
+
+    The full feed/live document is downloaded once; later refreshes ask MLB
+    for the patches since the copy's metaData.timeStamp and apply them
+    locally, so each refresh costs roughly the same however long the game
+    has run. Any patch that doesn't apply cleanly triggers a full reload.
+    Only the FEED_SELECTION sub-trees are ever built or patched.
+    """
+
+    def __init__(self, game_pk: int):
+        self.game_pk = game_pk
+        self.feed: Optional[Dict[str, Any]] = None
+        self.refreshed_at = 0.0
+        self.accessed_at = time.monotonic()  # last get_game_state lookup
+        self.cursor = PlayCursor()
+        self._lock = asyncio.Lock()
+
+    @property
+    def timecode(self) -> Optional[str]:
+        return (self.feed or {}).get("metaData", {}).get("timeStamp")
+
+    @property
+    def is_final(self) -> bool:
+        status = (self.feed or {}).get("gameData", {}).get("status", {})
+        return status.get("abstractGameState") == "Final"
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Bring the feed up to date and return it.
+
+        Calls within the live cache TTL of the last refresh (and any call
+        once the game is Final) reuse the current copy.
+        """
+        async with self._lock:
+            fresh = time.monotonic() - self.refreshed_at < CACHE_TTLS[CacheTier.LIVE]
+            if self.feed is not None and (fresh or self.is_final):
+                return self.feed
+            if self.feed is None or not self.timecode:
+                await self._load_full()
+            else:
+                await self._apply_diff()
+            self.refreshed_at = time.monotonic()
+            return self.feed
+
+    def _set_feed(self, feed: Dict[str, Any]):
+        if feed is not self.feed:
+            # The cursor holds references into the document it last read
+            self.cursor.reset()
+        self.feed = feed
+
+    async def _load_full(self):
+        # Not cached or shared: this copy is patched in place
+        self._set_feed(
+            await upstream.get_json(
+                FEED_URL.format(game_pk=self.game_pk), select=FEED_SELECTION
+            )
+        )
+
+    async def _apply_diff(self):
+        patches = await upstream.get_json(
+            DIFF_PATCH_URL.format(game_pk=self.game_pk, timecode=self.timecode)
+        )
+        if isinstance(patches, dict):
+            # MLB sends the whole feed when the diff would be larger
+            self._set_feed(FEED_SELECTION.project(patches))
+            return
+        try:
+            for patch in patches:
+                operations = select_patch(FEED_SELECTION, patch.get("diff", []))
+                self._set_feed(apply_patch(self.feed, operations))
+        except (PatchError, AttributeError, KeyError) as e:
+            logger.warning(f"diffPatch failed for game {self.game_pk}: {e}")
+            await self._load_full()
+
+
+_game_states: Dict[int, LiveGameState] = {}
+
+
+def get_game_state(game_pk: int) -> LiveGameState:
+    """State engine for a game, dropping ones nobody has asked for lately"""
+    now = time.monotonic()
+    for pk, state in list(_game_states.items()):
+        idle = now - state.accessed_at > GAME_STATE_IDLE_TIMEOUT
+        # A state mid-refresh is in use even if its last lookup was long ago
+        if pk != game_pk and idle and not state._lock.locked():
+            del _game_states[pk]
+            player_stats.forget_game(pk)
+    state = _game_states.get(game_pk)
+    if state is None:
+        state = _game_states[game_pk] = LiveGameState(game_pk)
+    state.accessed_at = now
+    return state
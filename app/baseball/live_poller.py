@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from ..constants import (
+    LIVE_POLL_IDLE_INTERVAL,
+    LIVE_POLL_INTERVAL,
+    LIVE_POLL_TEAM_TIMEOUT,
+)
+from ..snapshots import live_game_key, snapshot_hub
+from .baseball_api import get_live_game_details
+
+logger = logging.getLogger("baseball")
+
+
+class LiveGamePoller:
+    """Background refresher for the live game details devices poll.
+
+    A team is tracked from the first device request for it until no device
+    has asked for LIVE_POLL_TEAM_TIMEOUT seconds. Tracked teams are refreshed
+    on a cadence and the computed payload is kept in memory, so request
+    handlers only read a dictionary. Each payload is also published to the
+    snapshot hub for push and long-poll subscribers.
+    """
+
+    def __init__(
+        self,
+        interval: float = LIVE_POLL_INTERVAL,
+        idle_interval: float = LIVE_POLL_IDLE_INTERVAL,
+        team_timeout: float = LIVE_POLL_TEAM_TIMEOUT,
+    ):
+        self.interval = interval
+        self.idle_interval = idle_interval
+        self.team_timeout = team_timeout
+        # team_id -> details payload, or None when the team isn't playing
+        self._details: Dict[int, Optional[Dict[str, Any]]] = {}
+        self._last_requested: Dict[int, float] = {}
+        self._next_refresh: Dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def get_details(self, team_id: int) -> Optional[Dict[str, Any]]:
+        """Latest details for a team, fetching once if it isn't tracked yet"""
+        self._last_requested[team_id] = time.monotonic()
+        if team_id not in self._details:
+            await self._refresh(team_id)
+        return self._details.get(team_id)
+
+    async def _refresh(self, team_id: int):
+        try:
+            details = await get_live_game_details(team_id)
+        except Exception as e:
+            # Keep serving the previous payload until the next refresh
+            logger.warning(f"Live poll failed for team {team_id}: {e}")
+            details = self._details.get(team_id)
+        # Unchanged payloads keep their existing object and version
+        details = snapshot_hub.publish(live_game_key(team_id), details)
+        self._details[team_id] = details
+        delay = self.interval if details else self.idle_interval
+        self._next_refresh[team_id] = time.monotonic() + delay
+
+    def _forget(self, team_id: int):
+        self._details.pop(team_id, None)
+        self._last_requested.pop(team_id, None)
+        self._next_refresh.pop(team_id, None)
+
+    async def run(self):
+        while True:
+            now = time.monotonic()
+            for team_id, requested in list(self._last_requested.items()):
+                if now - requested > self.team_timeout:
+                    self._forget(team_id)
+
+            due = [
+                team_id
+                for team_id, next_refresh in self._next_refresh.items()
+                if next_refresh <= now
+            ]
+            if due:
+                await asyncio.gather(*(self._refresh(team_id) for team_id in due))
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global live game poller instance
+live_game_poller = LiveGamePoller()
@@ -0,0 +1,99 @@
+from typing import Any, Dict, List, Optional
+
+AT_BAT_EVENTS = [
+    "single",
+    "double",
+    "triple",
+    "home_run",
+    "field_out",
+    "grounded_into_double_play",
+    "force_out",
+    "strikeout",
+]
+HIT_EVENTS = ["single", "double", "triple", "home_run"]
+
+
+class BatterLine:
+    __slots__ = ("at_bats", "hits", "last_result")
+
+    def __init__(self):
+        self.at_bats = 0
+        self.hits = 0
+        self.last_result = ""
+
+    def __str__(self) -> str:
+        line = f"{self.hits}-for-{self.at_bats}"
+        if self.last_result:
+            line += f", {self.last_result.lower()}"
+        return line
+
+
+class PlayCursor:
+    """Incremental reader of one game's allPlays list.
+
+    Completed plays are tallied into per-batter lines exactly once, and
+    their latest pitch is remembered when they complete. The plays still in
+    progress (normally just the current at-bat) are rescanned in full on
+    every call, since diffPatch can add pitchData to an event or replace it
+    after it was first seen. Work per call is a few pitches, not the game.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.lines: Dict[int, BatterLine] = {}
+        self.latest_pitch: Optional[Dict[str, Any]] = None
+        self.latest_pitch_play: Optional[Dict[str, Any]] = None
+        self._complete_through = 0  # first play not yet tallied
+        self._completed_pitch: Optional[Dict[str, Any]] = None
+        self._completed_pitch_play: Optional[Dict[str, Any]] = None
+
+    def advance(self, all_plays: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Consume new plays and events; returns plays completed since last call"""
+        if len(all_plays) < self._complete_through:
+            self.reset()  # The feed was rewound; start over
+
+        completed = []
+        while self._complete_through < len(all_plays):
+            play = all_plays[self._complete_through]
+            if not play.get("about", {}).get("isComplete"):
+                break
+            self._tally(play)
+            pitch = self._last_pitch(play)
+            if pitch is not None:
+                self._completed_pitch = pitch
+                self._completed_pitch_play = play
+            completed.append(play)
+            self._complete_through += 1
+
+        self.latest_pitch = self._completed_pitch
+        self.latest_pitch_play = self._completed_pitch_play
+        for play in all_plays[self._complete_through :]:
+            pitch = self._last_pitch(play)
+            if pitch is not None:
+                self.latest_pitch = pitch
+                self.latest_pitch_play = play
+
+        return completed
+
+    @staticmethod
+    def _last_pitch(play: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        for event in reversed(play.get("playEvents", [])):
+            if event.get("type") == "pitch" and "pitchData" in event:
+                return event
+        return None
+
+    def _tally(self, play: Dict[str, Any]):
+        batter_id = play.get("matchup", {}).get("batter", {}).get("id")
+        result = play.get("result", {})
+        event_type = result.get("eventType", "")
+        line = self.lines.setdefault(batter_id, BatterLine())
+        if event_type in AT_BAT_EVENTS:
+            line.at_bats += 1
+            line.last_result = result.get("event", "")
+        if event_type in HIT_EVENTS:
+            line.hits += 1
+
+    def batter_line(self, batter_id: int) -> str:
+        return str(self.lines.get(batter_id) or BatterLine())
@@ -0,0 +1,81 @@
+import logging
+from typing import Any, Dict, Iterable, List, Set
+
+from ..upstream import upstream
+
+logger = logging.getLogger("baseball")
+
+PEOPLE_URL = (
+    "https://statsapi.mlb.com/api/v1/people?personIds={person_ids}"
+    "&hydrate=stats(group=[hitting],type=[season])"
+)
+
+
+def season_batting_avg(person: Dict[str, Any]) -> str:
+    return (
+        person.get("stats", [{}])[0]
+        .get("splits", [{}])[0]
+        .get("stat", {})
+        .get("avg", "N/A")
+    )
+
+
+def lineup_ids(feed: Dict[str, Any]) -> List[int]:
+    """Person ids of everyone in either team's batting order so far"""
+    ids: List[int] = []
+    teams = feed.get("liveData", {}).get("boxscore", {}).get("teams", {})
+    for side in ("away", "home"):
+        team = teams.get(side, {})
+        for person_id in team.get("battingOrder", []) + team.get("batters", []):
+            if person_id not in ids:
+                ids.append(person_id)
+    return ids
+
+
+class PlayerStatsCache:
+    """Season batting averages keyed by MLB person id.
+
+    Both lineups are fetched in one request when a game is first seen
+    live. Callers invalidate a batter's entry when one of their plate
+    appearances completes in a live feed, since that is the only time the
+    average can change.
+    """
+
+    def __init__(self):
+        self._avg: Dict[int, str] = {}
+        self._prefetched_games: Set[int] = set()
+
+    async def _fetch(self, person_ids: Iterable[int]):
+        person_ids = list(person_ids)
+        if not person_ids:
+            return
+        data = await upstream.get_json(
+            PEOPLE_URL.format(person_ids=",".join(str(i) for i in person_ids))
+        )
+        for person in data.get("people", []):
+            self._avg[person["id"]] = season_batting_avg(person)
+
+    async def prefetch_game(self, game_pk: int, feed: Dict[str, Any]):
+        """Load both lineups the first time a live game is seen"""
+        if game_pk in self._prefetched_games:
+            return
+        self._prefetched_games.add(game_pk)
+        try:
+            await self._fetch(lineup_ids(feed))
+        except Exception as e:
+            logger.warning(f"Lineup stats prefetch failed for game {game_pk}: {e}")
+
+    def invalidate(self, person_id: int):
+        self._avg.pop(person_id, None)
+
+    async def batting_avg(self, person_id: int) -> str:
+        if person_id not in self._avg:
+            await self._fetch([person_id])
+        return self._avg.get(person_id, "N/A")
+
+    def forget_game(self, game_pk: int):
+        self._prefetched_games.discard(game_pk)
+
+
+# Global batter stats cache
+player_stats = PlayerStatsCache()
@@ -1,11 +1,16 @@
 from sanic import Blueprint, response
+from ..compact import compact_response, wants_compact
+from ..constants import CompactKind
+from ..config_manager import config_manager
+from ..projection import projected_json
+from ..snapshots import live_game_key, long_poll, push_snapshots
 from .baseball_api import (
-    get_team_id_by_name,
     get_last_game,
     get_next_game,
     get_live_game,
-    get_live_game_details,
 )
+from .live_poller import live_game_poller
+from .teams import get_team_id_by_name
 
 baseball_bp = Blueprint("baseball", url_prefix="/baseball")
 
@@ -15,8 +20,10 @@ async def last_game(request, team_name):
     team_id = get_team_id_by_name(team_name)
     if not team_id:
         return response.json({"error": "Team not found"}, status=404)
-    game = get_last_game(team_id)
-    return response.json(game or {"error": "No completed game found"})
+    game = await get_last_game(team_id)
+    if not game:
+        return response.json({"error": "No completed game found"})
+    return projected_json(request, game, shared=True)
 
 
 @baseball_bp.get("/next/<team_name>")
@@ -25,8 +32,10 @@ async def next_game(request, team_name):
     print(team_id)
     if not team_id:
         return response.json({"error": "Team not found"}, status=404)
-    game = get_next_game(team_id)
-    return response.json(game or {"error": "No upcoming game found"})
+    game = await get_next_game(team_id)
+    if not game:
+        return response.json({"error": "No upcoming game found"})
+    return projected_json(request, game, shared=True)
 
 
 @baseball_bp.get("/live/<team_name>")
@@ -34,8 +43,10 @@ async def live_game(request, team_name):
     team_id = get_team_id_by_name(team_name)
     if not team_id:
         return response.json({"error": "Team not found"}, status=404)
-    game = get_live_game(team_id)
-    return response.json(game or {"error": "No live game found"})
+    game = await get_live_game(team_id)
+    if not game:
+        return response.json({"error": "No live game found"})
+    return projected_json(request, game, shared=True)
 
 
 @baseball_bp.get("/live/details/<team_name>")
@@ -44,10 +55,38 @@ async def live_details(request, team_name):
     if not team_id:
         return response.json({"error": "Team not found"}, status=404)
 
-    data = get_live_game_details(team_id)
+    data = await live_game_poller.get_details(team_id)
     if not data:
         return response.json({"error": "No live game found"}, status=404)
 
     # Optionally extract & format relevant fields here
+    if wants_compact(request):
+        return compact_response(CompactKind.LIVE_GAME, data)
 
-    return response.json(data)
+    return projected_json(request, data, shared=True)
+
+
+@baseball_bp.get("/live/details/<team_name>/wait")
+async def live_details_wait(request, team_name):
+    """Long-poll live details: answer once they change past ?version="""
+    team_id = get_team_id_by_name(team_name)
+    if not team_id:
+        return response.json({"error": "Team not found"}, status=404)
+
+    # Keeps the team tracked so the poller publishes its changes
+    await live_game_poller.get_details(team_id)
+    return await long_poll(request, live_game_key(team_id))
+
+
+@baseball_bp.websocket("/ws/live/<team_name>")
+async def live_details_ws(request, ws, team_name):
+    """Push live details for a team whenever they change"""
+    team_id = get_team_id_by_name(team_name)
+    if not team_id:
+        await ws.send(config_manager.encode({"error": "Team not found"}).decode())
+        return
+
+    # Asking the poller for the team keeps it tracked while subscribed
+    await push_snapshots(
+        ws, live_game_key(team_id), lambda: live_game_poller.get_details(team_id)
+    )
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytz
+
+from ..constants import (
+    CACHE_TTLS,
+    NEXT_GAME_HORIZON_DAYS,
+    SEASON_END,
+    SEASON_START,
+    CacheTier,
+)
+from ..upstream import upstream
+
+logger = logging.getLogger("baseball")
+
+PACIFIC = pytz.timezone("US/Pacific")
+SCHEDULE_URL = (
+    "https://statsapi.mlb.com/api/v1/schedule?sportId=1&teamId={team_id}"
+    "&startDate={start}&endDate={end}"
+)
+
+
+def flatten_schedule(schedule: Dict[str, Any]) -> Tuple[List[str], List[Dict]]:
+    """Split a /schedule payload into parallel, date-sorted date and game lists"""
+    dates, games = [], []
+    for day in sorted(schedule.get("dates", []), key=lambda d: d.get("date", "")):
+        for game in day.get("games", []):
+            dates.append(day["date"])
+            games.append(game)
+    return dates, games
+
+
+class TeamSeason:
+    """One team's schedule for a season, sorted by date for bisect lookups.
+
+    The whole season is fetched once (and revalidated daily to pick up
+    postponements); after that only the games around today are refreshed.
+    """
+
+    def __init__(self, team_id: int, season: int):
+        self.team_id = team_id
+        self.season = season
+        self.dates: List[str] = []
+        self.games: List[Dict[str, Any]] = []
+        self.loaded_at: Optional[float] = None
+        self._schedule: Optional[Dict[str, Any]] = None  # last full payload
+        self.today_refreshed_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def ensure_current(self, today: date):
+        async with self._lock:
+            now = time.monotonic()
+            if (
+                self.loaded_at is None
+                or now - self.loaded_at > CACHE_TTLS[CacheTier.STATIC]
+            ):
+                await self._load_season()
+            elif (
+                today.year == self.season
+                and now - self.today_refreshed_at > CACHE_TTLS[CacheTier.LIVE]
+            ):
+                # Other seasons have no games today; the daily reload suffices
+                start = max(today - timedelta(days=1), date(self.season, 1, 1))
+                await self._refresh_days(start, today)
+
+    async def _load_season(self):
+        schedule = await upstream.get_json(
+            SCHEDULE_URL.format(
+                team_id=self.team_id,
+                start=f"{self.season}-{SEASON_START}",
+                end=f"{self.season}-{SEASON_END}",
+            ),
+            tier=CacheTier.STATIC,
+        )
+        # On 304 Not Modified upstream hands back the same parsed payload
+        if schedule is not self._schedule:
+            self.dates, self.games = flatten_schedule(schedule)
+            self._schedule = schedule
+        self.loaded_at = self.today_refreshed_at = time.monotonic()
+
+    async def _refresh_days(self, start: date, end: date):
+        # Yesterday is included so games finishing after midnight turn Final
+        schedule = await upstream.get_json(
+            SCHEDULE_URL.format(
+                team_id=self.team_id, start=start.isoformat(), end=end.isoformat()
+            ),
+            tier=CacheTier.LIVE,
+        )
+        first, last = start.isoformat(), end.isoformat()
+        dates, games = flatten_schedule(schedule)
+        lo, hi = bisect_left(dates, first), bisect_right(dates, last)
+        dates, games = dates[lo:hi], games[lo:hi]
+
+        lo, hi = bisect_left(self.dates, first), bisect_right(self.dates, last)
+        self.dates[lo:hi] = dates
+        self.games[lo:hi] = games
+        self.today_refreshed_at = time.monotonic()
+
+    def last_final(self, today: str) -> Optional[Dict[str, Any]]:
+        for i in range(bisect_right(self.dates, today) - 1, -1, -1):
+            if self.games[i]["status"]["detailedState"] == "Final":
+                return self.games[i]
+        return None
+
+    def next_scheduled(self, after: str, until: str) -> Optional[Dict[str, Any]]:
+        for i in range(bisect_right(self.dates, after), len(self.games)):
+            if self.dates[i] > until:
+                break
+            if self.games[i]["status"]["detailedState"] == "Scheduled":
+                return self.games[i]
+        return None
+
+    def live(self, today: str) -> Optional[Dict[str, Any]]:
+        for i in range(bisect_left(self.dates, today), bisect_right(self.dates, today)):
+            state = self.games[i].get("status", {}).get("abstractGameState")
+            if state in ["Live", "In Progress"]:
+                return self.games[i]
+        return None
+
+
+class SeasonScheduleStore:
+    """Per-team season schedules answering last/next/live from memory"""
+
+    def __init__(self):
+        self._seasons: Dict[Tuple[int, int], TeamSeason] = {}
+
+    async def season(self, team_id: int, season: int, today: date) -> TeamSeason:
+        key = (team_id, season)
+        team_season = self._seasons.get(key)
+        if team_season is None:
+            team_season = self._seasons[key] = TeamSeason(team_id, season)
+        await team_season.ensure_current(today)
+        return team_season
+
+    async def last_game(self, team_id: int) -> Optional[Dict[str, Any]]:
+        today = datetime.now(PACIFIC).date()
+        for season in (today.year, today.year - 1):
+            game = (await self.season(team_id, season, today)).last_final(
+                today.isoformat()
+            )
+            if game:
+                return game
+        return None
+
+    async def next_game(self, team_id: int) -> Optional[Dict[str, Any]]:
+        today = datetime.now(PACIFIC).date()
+        until = (today + timedelta(days=NEXT_GAME_HORIZON_DAYS)).isoformat()
+        for season in range(today.year, int(until[:4]) + 1):
+            game = (await self.season(team_id, season, today)).next_scheduled(
+                today.isoformat(), until
+            )
+            if game:
+                return game
+        return None
+
+    async def live_game(self, team_id: int) -> Optional[Dict[str, Any]]:
+        today = datetime.now(PACIFIC).date()
+        return (await self.season(team_id, today.year, today)).live(today.isoformat())
+
+
+# Global season schedule store
+season_schedules = SeasonScheduleStore()
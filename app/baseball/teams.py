@@ -0,0 +1,160 @@
+import difflib
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+from ..constants import (
+    MLB_TEAMS_FILE,
+    TEAM_FUZZY_CACHE_SIZE,
+    TEAM_FUZZY_CUTOFF,
+    TEAM_FUZZY_MATCH,
+    CacheTier,
+)
+from .. import serialization
+from ..upstream import upstream
+from .baseball_api import BASE_URL, MLB_TEAMS
+
+logger = logging.getLogger("baseball")
+
+# Fields of the MLB /teams payload that devices may send as a team name
+TEAM_NAME_FIELDS = [
+    "name",
+    "teamName",
+    "abbreviation",
+    "locationName",
+    "shortName",
+    "franchiseName",
+    "clubName",
+]
+
+# Common nicknames and abbreviations not present in the /teams payload
+TEAM_ALIASES = {
+    "halos": 108,
+    "ari": 109,
+    "dbacks": 109,
+    "snakes": 109,
+    "os": 110,
+    "bosox": 111,
+    "cubbies": 112,
+    "tribe": 114,
+    "rox": 115,
+    "stros": 117,
+    "nats": 120,
+    "was": 120,
+    "as": 133,
+    "oak": 133,
+    "oakland": 133,
+    "oaklandathletics": 133,
+    "bucs": 134,
+    "friars": 135,
+    "cards": 138,
+    "jays": 141,
+    "phils": 143,
+    "chisox": 145,
+    "yanks": 147,
+    "brewcrew": 158,
+}
+
+
+def normalize_team_name(name: str) -> str:
+    """Lowercase and drop everything but letters and digits ("D-backs" -> "dbacks")"""
+    return "".join(c for c in name.lower() if c.isalnum())
+
+
+def load_cached_teams() -> List[Dict[str, Any]]:
+    if not MLB_TEAMS_FILE.exists():
+        return []
+    try:
+        return serialization.read_file(MLB_TEAMS_FILE).get("teams", [])
+    except (ValueError, IOError) as e:
+        logger.warning(f"Error loading cached teams: {e}")
+        return []
+
+
+class TeamResolver:
+    """Local name -> MLB team id index.
+
+    Names, team names, abbreviations, locations and aliases are normalized
+    into one dictionary so resolution is a single lookup. Keys shared by
+    more than one team ("new york", "chicago") are left out rather than
+    guessed. Unknown names can optionally fall back to a fuzzy match.
+    """
+
+    def __init__(self, teams: Optional[List[Dict[str, Any]]] = None):
+        self._index: Dict[str, int] = {}
+        # Bounded LRU: names come straight from request paths
+        self._fuzzy_hits: "OrderedDict[str, Optional[int]]" = OrderedDict()
+        self.build(teams or [])
+
+    def build(self, teams: List[Dict[str, Any]]):
+        candidates: Dict[str, Set[int]] = {}
+
+        def add(name, team_id):
+            key = normalize_team_name(str(name or ""))
+            if key:
+                candidates.setdefault(key, set()).add(team_id)
+
+        for team_id, info in MLB_TEAMS.items():
+            add(info["name"], team_id)
+            add(team_id, team_id)
+        for team in teams:
+            for field in TEAM_NAME_FIELDS:
+                add(team.get(field), team["id"])
+        for alias, team_id in TEAM_ALIASES.items():
+            add(alias, team_id)
+
+        self._index = {
+            key: next(iter(ids)) for key, ids in candidates.items() if len(ids) == 1
+        }
+        self._fuzzy_hits.clear()
+
+    def resolve(self, name: str, fuzzy: bool = TEAM_FUZZY_MATCH) -> Optional[int]:
+        key = normalize_team_name(name)
+        team_id = self._index.get(key)
+        if team_id is not None or not fuzzy or len(key) < 4:
+            return team_id
+
+        if key in self._fuzzy_hits:
+            self._fuzzy_hits.move_to_end(key)
+            return self._fuzzy_hits[key]
+
+        matches = difflib.get_close_matches(
+            key, self._index.keys(), n=1, cutoff=TEAM_FUZZY_CUTOFF
+        )
+        team_id = self._index[matches[0]] if matches else None
+        self._fuzzy_hits[key] = team_id
+        if len(self._fuzzy_hits) > TEAM_FUZZY_CACHE_SIZE:
+            self._fuzzy_hits.popitem(last=False)
+        return team_id
+
+
+# Global team resolver, built from MLB_TEAMS and the cached /teams payload
+team_resolver = TeamResolver(load_cached_teams())
+
+
+def get_team_id_by_name(name):
+    return team_resolver.resolve(name)
+
+
+async def refresh_teams():
+    """Rebuild the resolver from a fresh /teams payload and re-cache it"""
+    try:
+        payload = await upstream.get_json(
+            f"{BASE_URL}/teams?sportId=1", tier=CacheTier.STATIC
+        )
+    except Exception as e:
+        logger.warning(f"Failed to refresh MLB teams: {e}")
+        return
+
+    teams = [
+        {"id": team["id"], **{f: team.get(f) for f in TEAM_NAME_FIELDS}}
+        for team in payload.get("teams", [])
+        if "id" in team
+    ]
+    if not teams or teams == load_cached_teams():
+        return
+    team_resolver.build(teams)
+    try:
+        serialization.write_file(MLB_TEAMS_FILE, {"teams": teams}, indent=True)
+    except IOError as e:
+        logger.warning(f"Error caching teams: {e}")
@@ -0,0 +1,122 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from .baseball.baseball_api import get_last_game, get_next_game
+from .baseball.live_poller import live_game_poller
+from .baseball.teams import get_team_id_by_name
+from .cache import response_cache
+from .config_manager import config_manager
+from .constants import (
+    BUNDLE_STANDINGS_LIMIT,
+    PANEL_DEFAULT_SERIES,
+    PANEL_DEFAULT_TEAM,
+    CacheTier,
+)
+from .nascar.live_ingester import live_race_ingester
+from .nascar.schedule import get_upcoming_race_for_series
+from .nascar.standings import (
+    fetch_standings,
+    get_last_completed_race_id,
+    get_last_race_with_winner,
+)
+
+
+async def baseball_panel(panel: Dict[str, Any]) -> Dict[str, Any]:
+    team_name = panel.get("team", PANEL_DEFAULT_TEAM)
+    team_id = get_team_id_by_name(team_name)
+    if not team_id:
+        return {"team": team_name, "error": "Team not found"}
+    live, last, upcoming = await asyncio.gather(
+        live_game_poller.get_details(team_id),
+        get_last_game(team_id),
+        get_next_game(team_id),
+    )
+    return {"team": team_name, "live": live, "last": last, "next": upcoming}
+
+
+async def nascar_standings(series_id: int):
+    race_id = await get_last_completed_race_id(series_id)
+    return (
+        await fetch_standings(series_id, race_id, BUNDLE_STANDINGS_LIMIT)
+        if race_id
+        else None
+    )
+
+
+async def nascar_panel(panel: Dict[str, Any]) -> Dict[str, Any]:
+    series_id = int(panel.get("series_id", PANEL_DEFAULT_SERIES))
+    live, upcoming, last, standings = await asyncio.gather(
+        live_race_ingester.get_snapshot(),
+        get_upcoming_race_for_series(series_id),
+        get_last_race_with_winner(series_id),
+        nascar_standings(series_id),
+    )
+    if live and live.get("series_id") != series_id:
+        live = None  # Another series is on track
+    return {
+        "series_id": series_id,
+        "live": live,
+        "next": upcoming,
+        "last": last,
+        "standings": standings,
+    }
+
+
+# Panels that show upstream data; others (e.g. dashboard) need none
+PANEL_FETCHERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]] = {
+    "baseball": baseball_panel,
+    "nascar": nascar_panel,
+}
+
+
+class FrameBundler:
+    """One pre-encoded document with the data for all of a device's panels.
+
+    Every enabled panel's data is fetched concurrently. The encoded bundle
+    is cached at the live tier, keyed by device and config view version.
+    Concurrent requests for the same bundle share a single build.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def get(self, device_id: str) -> bytes:
+        view = config_manager.get_device_view(device_id)
+        key = f"bundle:{view.device_id}:{view.version}"
+        cached = response_cache.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._build(key, view))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _build(self, key: str, view) -> bytes:
+        panels = {
+            name: panel
+            for name, panel in (view.config or {}).get("panels", {}).items()
+            if panel.get("enabled", True) and name in PANEL_FETCHERS
+        }
+        results = await asyncio.gather(
+            *(PANEL_FETCHERS[name](panel) for name, panel in panels.items()),
+            return_exceptions=True,
+        )
+        data = {}
+        for name, result in zip(panels, results):
+            if isinstance(result, Exception):
+                print(f"[ERROR] Bundle panel {name} failed: {result}")
+                result = {"error": "Panel data unavailable"}
+            data[name] = result
+
+        body = config_manager.encode(
+            {"device": view.device_id, "version": view.version, "panels": data}
+        )
+        response_cache.set(key, body, CacheTier.LIVE)
+        return body
+
+
+# Global frame bundler instance
+frame_bundler = FrameBundler()
@@ -0,0 +1,86 @@
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .constants import CACHE_MAX_ENTRIES, CACHE_TTLS, CacheTier
+
+
+class CacheEntry:
+    __slots__ = ("value", "tier", "expires_at", "etag", "last_modified")
+
+    def __init__(
+        self,
+        value: Any,
+        tier: CacheTier,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        self.value = value
+        self.tier = tier
+        self.etag = etag
+        self.last_modified = last_modified
+        ttl = CACHE_TTLS[tier]
+        self.expires_at = None if ttl is None else time.monotonic() + ttl
+
+    def is_fresh(self) -> bool:
+        return self.expires_at is None or time.monotonic() < self.expires_at
+
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class ResponseCache:
+    """Bounded in-process cache shared by every upstream fetcher.
+
+    Freshness comes from the entry's CacheTier; once more than max_entries
+    keys are stored the least recently used one is evicted, so memory stays
+    flat on long-running hosts. Stale entries that carry HTTP validators are
+    kept so the upstream client can revalidate them with a conditional GET.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value if it is still fresh"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.is_fresh():
+            if not entry.has_validators():
+                del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for a key whether or not it is still fresh"""
+        return self._entries.get(key)
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        tier: CacheTier,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """Store a value under the freshness policy of its tier"""
+        self._entries[key] = CacheEntry(value, tier, etag, last_modified)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global response cache instance
+response_cache = ResponseCache()
@@ -0,0 +1,110 @@
+from typing import Any, Dict, List
+
+from sanic import Request, response
+from sanic.response import HTTPResponse
+
+from . import serialization
+from .config_manager import config_manager
+from .constants import COMPACT_SCHEMA_VERSION, CompactKind
+
+# Bodies are [schema_version, kind, status, payload] with fixed-position
+# payload arrays; the layouts are documented in the README
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+MSGPACK_ACCEPT = ("application/msgpack", "application/x-msgpack")
+
+
+def wants_compact(request: Request) -> bool:
+    """Whether the client asked for MessagePack (?format=msgpack or Accept)"""
+    if request.args.get("format") == "msgpack":
+        return True
+    accept = request.headers.get("Accept", "")
+    return any(content_type in accept for content_type in MSGPACK_ACCEPT)
+
+
+def compact_live_game(details: Dict[str, Any]) -> List[Any]:
+    teams = details["teams"]
+    speed = details.get("pitch_speed")
+    return [
+        details["batter"],
+        details["batting_avg"],
+        details["pitcher"],
+        details["todays_line"],
+        0 if details["inning"]["half"] == "Top" else 1,
+        details["inning"]["number"],
+        details["count"]["balls"],
+        details["count"]["strikes"],
+        details["count"]["outs"],
+        teams["away"],
+        details["score"].get(teams["away"]),
+        teams["home"],
+        details["score"].get(teams["home"]),
+        list(details["colors"]["away"]),
+        list(details["colors"]["home"]),
+        details["matrix_location"]["x"],
+        details["matrix_location"]["y"],
+        details["outcome"],
+        details["pitch_type"],
+        speed if isinstance(speed, (int, float)) else None,
+    ]
+
+
+def compact_live_race(race: Dict[str, Any]) -> List[Any]:
+    return [
+        race.get("lap_number"),
+        race.get("laps_in_race"),
+        race.get("flag_state"),
+        race.get("time_of_day_os_formatted"),
+        [
+            [
+                v.get("position"),
+                v.get("vehicle_number"),
+                v.get("short_display_name"),
+                v.get("laps_completed"),
+                v.get("last_lap_time"),
+                v.get("last_lap_speed"),
+            ]
+            for v in race.get("vehicles", [])
+        ],
+    ]
+
+
+def compact_config(config: Dict[str, Any]) -> List[Any]:
+    return [
+        config.get("mode", "auto"),
+        config.get("live_content_timeout"),
+        config.get("rotation_interval"),
+        config.get("sub_panel_duration_offset"),
+        [
+            [
+                name,
+                panel.get("enabled", True),
+                panel.get("duration"),
+                panel.get("priority"),
+            ]
+            for name, panel in config.get("panels", {}).items()
+        ],
+    ]
+
+
+COMPACTORS = {
+    CompactKind.LIVE_GAME: compact_live_game,
+    CompactKind.LIVE_RACE: compact_live_race,
+    CompactKind.CONFIG: compact_config,
+}
+
+
+def compact_response(kind: CompactKind, payload: Dict[str, Any]) -> HTTPResponse:
+    """MessagePack response for payload in kind's fixed layout"""
+    if not serialization.msgpack_available():
+        return response.json({"error": "MessagePack is not available"}, status=406)
+    body = serialization.msgpack_dumps(
+        [
+            COMPACT_SCHEMA_VERSION,
+            kind.value,
+            config_manager.get_mode(),
+            COMPACTORS[kind](payload),
+        ]
+    )
+    return response.raw(
+        body, content_type=MSGPACK_CONTENT_TYPE, headers={"Vary": "Accept"}
+    )
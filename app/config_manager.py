@@ -1,29 +1,113 @@
-import json
+import asyncio
 import os
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
-from .constants import CONFIG_FILE, DEFAULT_CONFIG, DisplayMode, PanelPriority
+from typing import Any, Callable, Dict, List, Optional
+from . import serialization
+from .http_cache import make_etag
+from .constants import (
+    CONFIG_FILE,
+    CONFIG_SAVE_DELAY,
+    DEFAULT_CONFIG,
+    DEFAULT_DEVICE,
+    DEFAULT_MODE,
+    DisplayMode,
+    PanelPriority,
+    PanelStatus,
+)
+
+
+class DeviceConfigView:
+    """Resolved config for one device with its polled responses pre-encoded.
+
+    Built once per change to the device's config (or the display mode) and
+    shared by every poll until then; version increases with each rebuild.
+    """
+
+    __slots__ = (
+        "device_id",
+        "version",
+        "config",
+        "mode",
+        "config_body",
+        "config_etag",
+        "status_body",
+        "status_etag",
+        "updated_at",
+        "panels_body",
+        "panels_etag",
+    )
+
+    def __init__(
+        self,
+        device_id: str,
+        version: int,
+        config: Optional[Dict[str, Any]],
+        encode: Callable[[Any], bytes],
+    ):
+        self.device_id = device_id
+        self.version = version
+        self.config = config
+        self.mode = (config or {}).get("mode", "auto")
+        self.config_body = encode(config)
+        self.config_etag = make_etag(self.config_body)
+        self.status_body = encode({"mode": self.mode, "status": self.mode})
+        self.status_etag = make_etag(self.status_body)
+        self.updated_at = datetime.utcnow().isoformat() + "Z"
+        panel_states = {
+            name: {
+                "has_live_content": name in ["baseball", "nascar"],  # Mock detection
+                "last_update": self.updated_at,
+                "status": (
+                    PanelStatus.ACTIVE.value
+                    if panel.get("enabled", True)
+                    else PanelStatus.DISABLED.value
+                ),
+                "current_sub_panel": (
+                    "live_game"
+                    if name == "baseball"
+                    else "cup_races" if name == "nascar" else "system_status"
+                ),
+            }
+            for name, panel in (config or {}).get("panels", {}).items()
+        }
+        self.panels_body = encode(panel_states)
+        self.panels_etag = make_etag(self.panels_body)
 
 
 class ConfigManager:
+    """Device/display configuration backed by config.json.
+
+    Updates change the in-memory config immediately. Inside the server the
+    file is written in the background: updates within CONFIG_SAVE_DELAY of
+    each other are coalesced into one write, done off the event loop and
+    atomically (temp file, then rename). flush() writes anything pending.
+    """
+
     def __init__(self):
         self.config_file = CONFIG_FILE
+        self._dirty = False
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._views: Dict[str, DeviceConfigView] = {}
+        self._view_version = 0
+        self._mode_listeners: List[Callable[[], None]] = []
         self.config = self._load_config()
 
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file or create default"""
         if self.config_file.exists():
             try:
-                with open(self.config_file, "r") as f:
-                    config = json.load(f)
+                config = serialization.read_file(self.config_file)
                 # Merge with defaults to ensure all fields exist
                 return self._merge_with_defaults(config)
-            except (json.JSONDecodeError, IOError) as e:
+            except (ValueError, IOError) as e:
                 print(f"Error loading config: {e}, using defaults")
                 return DEFAULT_CONFIG.copy()
         else:
             # Create default config file
-            self._save_config(DEFAULT_CONFIG)
+            self._write_config(DEFAULT_CONFIG)
             return DEFAULT_CONFIG.copy()
 
     def _merge_with_defaults(self, config: Dict[str, Any]) -> Dict[str, Any]:
@@ -65,28 +149,92 @@ class ConfigManager:
         return merged
 
     def _save_config(self, config: Dict[str, Any]) -> bool:
-        """Save configuration to file"""
+        """Persist configuration, in the background when a loop is running"""
         try:
-            self.config_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_file, "w") as f:
-                json.dump(config, f, indent=2)
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._write_config(config)
+
+        self._dirty = True
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(CONFIG_SAVE_DELAY, self._start_flush)
+        return True
+
+    def _write_config(self, config: Dict[str, Any]) -> bool:
+        """Save configuration to file now"""
+        try:
+            self._write_bytes(serialization.dumps(config, indent=True))
             return True
         except IOError as e:
             print(f"Error saving config: {e}")
             return False
 
+    def _start_flush(self):
+        self._save_handle = None
+        self._flush_task = asyncio.ensure_future(self.flush())
+
+    async def flush(self) -> bool:
+        """Write pending updates now (called when the server stops)"""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+
+        async with self._write_lock:
+            if not self._dirty:
+                return True
+            self._dirty = False
+            # Snapshot on the loop so handlers can't mutate it mid-encode
+            data = serialization.dumps(self.config, indent=True)
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, self._write_bytes, data)
+                return True
+            except IOError as e:
+                print(f"Error saving config: {e}")
+                self._dirty = True
+                return False
+
+    def _write_bytes(self, data: bytes):
+        self.config_file.parent.mkdir(parents=True, exist_ok=True)
+        serialization.atomic_write(self.config_file, data)
+
     def get_device_config(self, device_id: str) -> Dict[str, Any]:
         """Get configuration for a specific device"""
         # Fallback to 'baseball_1' if device_id not found
         return self.config["devices"].get(device_id) or self.config["devices"].get(
-            "baseball_1"
+            DEFAULT_DEVICE
         )
 
+    def get_device_view(self, device_id: str) -> DeviceConfigView:
+        """Pre-encoded view of a device's config, rebuilt only after changes"""
+        if not self.config["devices"].get(device_id):
+            device_id = DEFAULT_DEVICE
+        view = self._views.get(device_id)
+        if view is None:
+            self._view_version += 1
+            view = DeviceConfigView(
+                device_id,
+                self._view_version,
+                self.get_device_config(device_id),
+                self.encode,
+            )
+            self._views[device_id] = view
+        return view
+
+    def encode(self, body: Any) -> bytes:
+        """Encode a JSON response body with the current display mode merged in"""
+        if isinstance(body, dict):
+            body = {**body, "status": self.get_mode()}
+        return serialization.dumps(body)
+
     def update_device_config(self, device_id: str, updates: Dict[str, Any]) -> bool:
         """Update configuration for a specific device"""
         if device_id not in self.config["devices"]:
             self.config["devices"][device_id] = {}
         self._deep_merge(self.config["devices"][device_id], updates)
+        self._views.pop(device_id, None)
         return self._save_config(self.config)
 
     def get_all_devices(self) -> Dict[str, Any]:
@@ -95,17 +243,24 @@ class ConfigManager:
 
     def get_mode(self) -> str:
         """Get current display mode"""
-        return self.config.get("mode", DEFAULT_CONFIG["mode"])
+        return self.config.get("mode", DEFAULT_MODE.value)
 
     def set_mode(self, mode: str) -> bool:
         """Set display mode"""
         try:
             DisplayMode(mode)  # Validate mode
             self.config["mode"] = mode
+            self._views.clear()  # Every encoded body carries the mode
+            for listener in self._mode_listeners:
+                listener()
             return self._save_config(self.config)
         except ValueError:
             return False
 
+    def add_mode_listener(self, listener: Callable[[], None]):
+        """Call listener after every display mode change"""
+        self._mode_listeners.append(listener)
+
     def get_panel_config(self, panel_name: str) -> Optional[Dict[str, Any]]:
         """Get configuration for a specific panel"""
         return self.config.get("panels", {}).get(panel_name)
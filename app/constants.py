@@ -1,5 +1,6 @@
+import os
 from pathlib import Path
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class DisplayMode(str, Enum):
@@ -28,12 +29,35 @@ class ApiStatus(str, Enum):
     ERROR = "error"
 
 
+class CacheTier(str, Enum):
+    LIVE = "live"
+    SCHEDULE = "schedule"
+    STATIC = "static"
+    FINAL = "final"
+
+
+class CompactKind(IntEnum):
+    LIVE_GAME = 1
+    LIVE_RACE = 2
+    CONFIG = 3
+
+
+class JsonBackend(str, Enum):
+    AUTO = "auto"
+    ORJSON = "orjson"
+    MSGSPEC = "msgspec"
+    STDLIB = "json"
+
+
 # File paths
 STATUS_FILE = Path(__file__).parent / "data" / "display_status.json"
 CONFIG_FILE = Path(__file__).parent / "data" / "config.json"
+CONFIG_SAVE_DELAY = 1.0  # seconds to gather config updates into one write
+MLB_TEAMS_FILE = Path(__file__).parent / "data" / "mlb_teams.json"
 
 # Default configuration
 DEFAULT_MODE = DisplayMode.AUTO
+DEFAULT_DEVICE = "baseball_1"  # config served to devices without their own
 
 DEFAULT_CONFIG = {
     "devices": {
@@ -103,3 +127,73 @@ DEFAULT_CONFIG = {
         },
     }
 }
+
+# Upstream HTTP client (seconds / connection counts)
+UPSTREAM_TIMEOUT = 10.0
+UPSTREAM_CONNECT_TIMEOUT = 3.0
+UPSTREAM_MAX_CONNECTIONS = 20
+UPSTREAM_MAX_CONNECTIONS_PER_HOST = 6
+UPSTREAM_KEEPALIVE_EXPIRY = 30.0
+
+# In-process response cache: freshness per tier in seconds (None = never expires)
+CACHE_TTLS = {
+    CacheTier.LIVE: 5,  # live race/game feeds
+    CacheTier.SCHEDULE: 6 * 60 * 60,  # season schedules
+    CacheTier.STATIC: 24 * 60 * 60,  # team lists and other reference data
+    CacheTier.FINAL: None,  # completed-race standings and Final games
+}
+CACHE_MAX_ENTRIES = 256
+
+# Selective upstream parsing: bodies larger than this (bytes) are streamed
+# through ijson instead of decoded whole and projected
+STREAM_PARSE_THRESHOLD = 4 * 1024 * 1024
+
+# Background live game poller (seconds)
+LIVE_POLL_INTERVAL = 5  # refresh cadence while a team's game is live
+LIVE_POLL_IDLE_INTERVAL = 60  # how often to look for a game when none is live
+LIVE_POLL_TEAM_TIMEOUT = 10 * 60  # stop tracking teams no device has asked about
+GAME_STATE_IDLE_TIMEOUT = 10 * 60  # drop live feed copies nobody has asked for
+
+# NASCAR live feed ingester (seconds)
+NASCAR_LIVE_POLL_INTERVAL = 5  # feed polling cadence inside a race window
+NASCAR_LIVE_IDLE_INTERVAL = 60  # how often to re-check the schedule otherwise
+RACE_WINDOW_BEFORE = 30 * 60  # start polling this long before a session
+RACE_WINDOW_AFTER = 5 * 60 * 60  # and keep polling this long after it starts
+
+# Push subscriptions: how often an open socket re-registers interest with the
+# live poller/ingester (must stay below LIVE_POLL_TEAM_TIMEOUT)
+PUSH_RETRACK_INTERVAL = 60
+LONG_POLL_TIMEOUT = 25  # default hold for long-poll requests (seconds)
+LONG_POLL_MAX_TIMEOUT = 55  # longest hold a device may ask for
+
+# MLB team name resolution
+TEAM_FUZZY_MATCH = True  # fall back to close matches for misspelled names
+TEAM_FUZZY_CUTOFF = 0.8
+TEAM_FUZZY_CACHE_SIZE = 256  # fuzzy lookups (hits and misses) remembered
+
+# MLB season schedule index
+SEASON_START = "02-01"  # month-day bounds of the schedule fetched per season
+SEASON_END = "11-30"
+NEXT_GAME_HORIZON_DAYS = 30  # how far ahead /baseball/next looks
+
+# ?fields= projections: compiled field sets kept, encoded payloads per set
+PROJECTION_CACHE_SIZE = 64
+PROJECTION_ENCODED_PER_FIELDS = 16
+
+# Composite frame bundles: what a panel shows unless its config says otherwise
+# ("team" / "series_id" keys in the panel's config)
+PANEL_DEFAULT_TEAM = "Dodgers"
+PANEL_DEFAULT_SERIES = 1  # NASCAR Cup Series
+BUNDLE_STANDINGS_LIMIT = 10
+
+# Server-rendered RGB565 panel frames
+FRAME_WIDTH = 64
+FRAME_HEIGHT = 64
+FRAME_CACHE_SIZE = 64  # rendered frames kept, keyed by state hash
+
+# Compact MessagePack payloads for matrix devices; bump when a layout changes
+COMPACT_SCHEMA_VERSION = 1
+
+# JSON encoder/decoder used for responses, upstream bodies and data files
+# ("auto" picks orjson, then msgspec, then the stdlib json module)
+JSON_BACKEND = os.environ.get("SPORTS_API_JSON_BACKEND", JsonBackend.AUTO.value)
@@ -0,0 +1,396 @@
+import datetime
+import hashlib
+import sys
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from . import serialization
+from .baseball.baseball_api import get_team_info
+from .bundle import PANEL_FETCHERS
+from .config_manager import config_manager
+from .constants import FRAME_CACHE_SIZE, FRAME_HEIGHT, FRAME_WIDTH
+from .nascar.schedule import EASTERN, PACIFIC
+
+# 3x5 pixel font, one string per row ("#" = lit); lowercase draws as uppercase
+# and characters without a glyph draw as "?"
+GLYPH_WIDTH = 3
+GLYPH_HEIGHT = 5
+CHAR_ADVANCE = GLYPH_WIDTH + 1
+LINE_HEIGHT = GLYPH_HEIGHT + 1
+
+_GLYPHS = {
+    " ": ("...", "...", "...", "...", "..."),
+    "0": ("###", "#.#", "#.#", "#.#", "###"),
+    "1": (".#.", "##.", ".#.", ".#.", "###"),
+    "2": ("###", "..#", "###", "#..", "###"),
+    "3": ("###", "..#", ".##", "..#", "###"),
+    "4": ("#.#", "#.#", "###", "..#", "..#"),
+    "5": ("###", "#..", "###", "..#", "###"),
+    "6": ("###", "#..", "###", "#.#", "###"),
+    "7": ("###", "..#", ".#.", ".#.", ".#."),
+    "8": ("###", "#.#", "###", "#.#", "###"),
+    "9": ("###", "#.#", "###", "..#", "###"),
+    "A": (".#.", "#.#", "###", "#.#", "#.#"),
+    "B": ("##.", "#.#", "##.", "#.#", "##."),
+    "C": (".##", "#..", "#..", "#..", ".##"),
+    "D": ("##.", "#.#", "#.#", "#.#", "##."),
+    "E": ("###", "#..", "##.", "#..", "###"),
+    "F": ("###", "#..", "##.", "#..", "#.."),
+    "G": (".##", "#..", "#.#", "#.#", ".##"),
+    "H": ("#.#", "#.#", "###", "#.#", "#.#"),
+    "I": ("###", ".#.", ".#.", ".#.", "###"),
+    "J": ("..#", "..#", "..#", "#.#", ".#."),
+    "K": ("#.#", "#.#", "##.", "#.#", "#.#"),
+    "L": ("#..", "#..", "#..", "#..", "###"),
+    "M": ("#.#", "###", "###", "#.#", "#.#"),
+    "N": ("##.", "#.#", "#.#", "#.#", "#.#"),
+    "O": (".#.", "#.#", "#.#", "#.#", ".#."),
+    "P": ("##.", "#.#", "##.", "#..", "#.."),
+    "Q": (".#.", "#.#", "#.#", "##.", ".##"),
+    "R": ("##.", "#.#", "##.", "#.#", "#.#"),
+    "S": (".##", "#..", ".#.", "..#", "##."),
+    "T": ("###", ".#.", ".#.", ".#.", ".#."),
+    "U": ("#.#", "#.#", "#.#", "#.#", "###"),
+    "V": ("#.#", "#.#", "#.#", "#.#", ".#."),
+    "W": ("#.#", "#.#", "###", "###", "#.#"),
+    "X": ("#.#", "#.#", ".#.", "#.#", "#.#"),
+    "Y": ("#.#", "#.#", ".#.", ".#.", ".#."),
+    "Z": ("###", "..#", ".#.", "#..", "###"),
+    ".": ("...", "...", "...", "...", ".#."),
+    ",": ("...", "...", "...", ".#.", "#.."),
+    ":": ("...", ".#.", "...", ".#.", "..."),
+    "-": ("...", "...", "###", "...", "..."),
+    "/": ("..#", "..#", ".#.", "#..", "#.."),
+    "'": (".#.", ".#.", "...", "...", "..."),
+    "#": ("#.#", "###", "#.#", "###", "#.#"),
+    "(": (".#.", "#..", "#..", "#..", ".#."),
+    ")": (".#.", "..#", "..#", "..#", ".#."),
+    "!": (".#.", ".#.", ".#.", "...", ".#."),
+    "?": ("###", "..#", ".##", "...", ".#."),
+    "&": (".#.", "#.#", ".#.", "#.#", ".##"),
+}
+
+# Lit pixel offsets per glyph, precomputed once
+FONT = {
+    char: tuple(
+        (x, y)
+        for y, row in enumerate(rows)
+        for x, cell in enumerate(row)
+        if cell == "#"
+    )
+    for char, rows in _GLYPHS.items()
+}
+
+
+def rgb565(r: int, g: int, b: int) -> int:
+    """Pack 8-bit channels into a 16-bit RGB565 pixel"""
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+
+def team_rgb565(color: Tuple[int, int, int]) -> int:
+    """RGB565 for an MLB_TEAMS color (channels on a 0-15 scale)"""
+    r, g, b = (min(max(int(c), 0), 15) * 17 for c in color)
+    return rgb565(r, g, b)
+
+
+BLACK = rgb565(0, 0, 0)
+WHITE = rgb565(255, 255, 255)
+GRAY = rgb565(96, 96, 96)
+RED = rgb565(255, 0, 0)
+GREEN = rgb565(0, 255, 0)
+YELLOW = rgb565(255, 255, 0)
+AMBER = rgb565(255, 160, 0)
+
+# NASCAR flag_state values
+FLAG_COLORS = {1: GREEN, 2: YELLOW, 3: RED, 4: WHITE}
+
+
+class Canvas:
+    """A FRAME_WIDTH x FRAME_HEIGHT RGB565 frame, little-endian 16-bit pixels"""
+
+    def __init__(self, width: int = FRAME_WIDTH, height: int = FRAME_HEIGHT):
+        self.width = width
+        self.height = height
+        self.pixels = array("H", [BLACK]) * (width * height)
+
+    def set(self, x: int, y: int, color: int):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.pixels[y * self.width + x] = color
+
+    def fill(self, x: int, y: int, w: int, h: int, color: int):
+        for row in range(max(y, 0), min(y + h, self.height)):
+            start = row * self.width
+            for col in range(max(x, 0), min(x + w, self.width)):
+                self.pixels[start + col] = color
+
+    def outline(self, x: int, y: int, w: int, h: int, color: int):
+        self.fill(x, y, w, 1, color)
+        self.fill(x, y + h - 1, w, 1, color)
+        self.fill(x, y, 1, h, color)
+        self.fill(x + w - 1, y, 1, h, color)
+
+    def text(self, x: int, y: int, text: str, color: int, width: int = None) -> int:
+        """Draw text at (x, y), clipped to width pixels; returns the end x"""
+        limit = x + (self.width - x if width is None else width)
+        for char in str(text).upper():
+            if x + GLYPH_WIDTH > limit:
+                break
+            for dx, dy in FONT.get(char, FONT["?"]):
+                self.set(x + dx, y + dy, color)
+            x += CHAR_ADVANCE
+        return x
+
+    def text_right(self, right: int, y: int, text: str, color: int):
+        """Draw text ending at column right"""
+        self.text(right - len(str(text)) * CHAR_ADVANCE + 1, y, text, color)
+
+    def tobytes(self) -> bytes:
+        if sys.byteorder == "little":
+            return self.pixels.tobytes()
+        swapped = array("H", self.pixels)
+        swapped.byteswap()
+        return swapped.tobytes()
+
+
+def wrap(text: str, chars: int, lines: int):
+    """Split text into at most lines lines of at most chars characters"""
+    wrapped, line = [], ""
+    for word in str(text).split():
+        if line and len(line) + 1 + len(word) > chars:
+            wrapped.append(line)
+            line = ""
+        line = f"{line} {word}" if line else word[:chars]
+    if line:
+        wrapped.append(line)
+    return wrapped[:lines]
+
+
+def short_time(dt: datetime.datetime) -> str:
+    """Pacific 'OCT 18 7:10PM' for a tz-aware datetime"""
+    local = dt.astimezone(PACIFIC)
+    return f"{local:%b} {local.day} {local.hour % 12 or 12}:{local:%M%p}"
+
+
+def _game_time(game: Dict[str, Any]) -> Optional[str]:
+    try:
+        start = datetime.datetime.fromisoformat(game["gameDate"].replace("Z", "+00:00"))
+    except (KeyError, AttributeError, ValueError):
+        return game.get("officialDate")
+    return short_time(start)
+
+
+def _race_time(race: Dict[str, Any]) -> Optional[str]:
+    try:
+        start = EASTERN.localize(datetime.datetime.fromisoformat(race["race_date"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+    return short_time(start)
+
+
+# Frame states: the drawn content of a panel reduced to plain values.
+# Frames are cached by a hash of their state, so only what is drawn goes in.
+
+
+def baseball_state(data: Dict[str, Any]) -> Dict[str, Any]:
+    live = data.get("live")
+    if live:
+        teams = live["teams"]
+        return {
+            "layout": "live_game",
+            "away": teams["away"],
+            "home": teams["home"],
+            "away_score": live["score"].get(teams["away"]),
+            "home_score": live["score"].get(teams["home"]),
+            "away_color": list(live["colors"]["away"]),
+            "home_color": list(live["colors"]["home"]),
+            "top": live["inning"]["half"] == "Top",
+            "inning": live["inning"]["number"],
+            "count": [live["count"][k] for k in ("balls", "strikes", "outs")],
+            "batter": live["batter"],
+            "pitcher": live["pitcher"],
+            "zone": [live["matrix_location"]["x"], live["matrix_location"]["y"]],
+            "outcome": live["outcome"],
+        }
+
+    game, label = data.get("next"), "NEXT"
+    if not game:
+        game, label = data.get("last"), "FINAL"
+    if not game:
+        return {"layout": "message", "lines": [data.get("team", ""), "NO GAMES"]}
+
+    state = {"layout": "game", "label": label, "time": _game_time(game)}
+    for side in ("away", "home"):
+        entry = game.get("teams", {}).get(side, {})
+        info = get_team_info(entry.get("team", {}).get("id"))
+        state[side] = info["name"]
+        state[f"{side}_color"] = list(info["color"])
+        state[f"{side}_score"] = entry.get("score") if label == "FINAL" else None
+    return state
+
+
+def nascar_state(data: Dict[str, Any]) -> Dict[str, Any]:
+    live = data.get("live")
+    if live:
+        return {
+            "layout": "live_race",
+            "lap": live.get("lap_number"),
+            "laps": live.get("laps_in_race"),
+            "flag": live.get("flag_state"),
+            "leaders": [
+                [
+                    v.get("position"),
+                    v.get("vehicle_number"),
+                    v.get("short_display_name"),
+                ]
+                for v in live.get("vehicles", [])
+            ],
+        }
+
+    race, label = data.get("next"), "NEXT RACE"
+    if not race:
+        race, label = data.get("last"), "LAST RACE"
+    if not race:
+        return {"layout": "message", "lines": ["NASCAR", "NO RACES"]}
+    return {
+        "layout": "race",
+        "label": label,
+        "name": race.get("race_name", ""),
+        "track": race.get("track_name", ""),
+        "time": _race_time(race),
+        "winner": race.get("winner_name") if label == "LAST RACE" else None,
+    }
+
+
+PANEL_STATES: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "baseball": baseball_state,
+    "nascar": nascar_state,
+}
+
+
+def _team_row(canvas: Canvas, y: int, name: str, color, score):
+    canvas.fill(0, y - 1, 2, LINE_HEIGHT + 1, team_rgb565(color))
+    canvas.text(4, y, name, WHITE, width=44)
+    if score is not None:
+        canvas.text_right(63, y, score, WHITE)
+
+
+def draw_live_game(canvas: Canvas, state: Dict[str, Any]):
+    _team_row(canvas, 1, state["away"], state["away_color"], state["away_score"])
+    _team_row(canvas, 8, state["home"], state["home_color"], state["home_score"])
+
+    balls, strikes, outs = state["count"]
+    half = "T" if state["top"] else "B"
+    canvas.text(0, 16, f"{half}{state['inning']}", AMBER)
+    canvas.text(16, 16, f"{balls}-{strikes}", WHITE)
+    canvas.text(36, 16, f"{outs} OUT", WHITE)
+
+    # Strike zone: the 10x15 grid map_to_zone targets, outlined, with the
+    # pitch marked (pitches outside the zone are pinned just past the edge)
+    zone_x, zone_y = 50, 26
+    canvas.outline(zone_x - 1, zone_y - 1, 12, 17, GRAY)
+    col, row = state["zone"]
+    px = zone_x + min(max(col, -3), 11)
+    py = zone_y + min(max(row, -3), 16)
+    canvas.fill(px - 1, py - 1, 2, 2, RED)
+
+    canvas.text(0, 26, "AB", GRAY)
+    canvas.text(0, 32, state["batter"], WHITE, width=44)
+    canvas.text(0, 40, "P", GRAY)
+    canvas.text(0, 46, state["pitcher"], WHITE, width=44)
+    canvas.text(0, 57, state["outcome"], AMBER)
+
+
+def draw_game(canvas: Canvas, state: Dict[str, Any]):
+    canvas.text(0, 1, state["label"], AMBER)
+    _team_row(canvas, 12, state["away"], state["away_color"], state["away_score"])
+    canvas.text(4, 20, "AT", GRAY)
+    _team_row(canvas, 28, state["home"], state["home_color"], state["home_score"])
+    if state["time"]:
+        for i, line in enumerate(wrap(state["time"], 16, 2)):
+            canvas.text(0, 44 + i * LINE_HEIGHT, line, WHITE)
+
+
+def draw_live_race(canvas: Canvas, state: Dict[str, Any]):
+    canvas.fill(0, 0, FRAME_WIDTH, 2, FLAG_COLORS.get(state["flag"], GRAY))
+    laps = f"/{state['laps']}" if state["laps"] else ""
+    canvas.text(0, 4, f"LAP {state['lap']}{laps}", WHITE)
+    for i, (position, number, name) in enumerate(state["leaders"][:3]):
+        y = 14 + i * 16
+        canvas.text(0, y, f"{position} #{number}", AMBER)
+        canvas.text(0, y + LINE_HEIGHT, name, WHITE)
+
+
+def draw_race(canvas: Canvas, state: Dict[str, Any]):
+    canvas.text(0, 1, state["label"], AMBER)
+    y = 10
+    for line in wrap(state["name"], 16, 3):
+        canvas.text(0, y, line, WHITE)
+        y += LINE_HEIGHT
+    for line in wrap(state["track"], 16, 2):
+        canvas.text(0, y + 2, line, GRAY)
+        y += LINE_HEIGHT
+    if state["winner"]:
+        canvas.text(0, 52, "WIN", AMBER)
+        canvas.text(16, 52, state["winner"], WHITE)
+    elif state["time"]:
+        canvas.text(0, 52, state["time"], WHITE)
+
+
+def draw_message(canvas: Canvas, state: Dict[str, Any]):
+    lines = state["lines"]
+    top = (FRAME_HEIGHT - len(lines) * LINE_HEIGHT) // 2
+    for i, line in enumerate(lines):
+        x = (FRAME_WIDTH - len(line) * CHAR_ADVANCE) // 2
+        canvas.text(max(x, 0), top + i * LINE_HEIGHT, line, WHITE)
+
+
+LAYOUTS = {
+    "live_game": draw_live_game,
+    "game": draw_game,
+    "live_race": draw_live_race,
+    "race": draw_race,
+    "message": draw_message,
+}
+
+
+class FrameRenderer:
+    """Renders frame states to RGB565 bytes, caching frames by state hash.
+
+    A state that hashes the same as one drawn before is served from the
+    cache, so a panel is only re-rendered when what it shows changes. The
+    hash doubles as the frame's ETag.
+    """
+
+    def __init__(self, max_entries: int = FRAME_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._frames: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def render(self, state: Dict[str, Any]) -> Tuple[str, bytes]:
+        digest = hashlib.blake2b(serialization.dumps(state), digest_size=12)
+        etag = f'"{digest.hexdigest()}"'
+        frame = self._frames.get(etag)
+        if frame is not None:
+            self._frames.move_to_end(etag)
+            return etag, frame
+
+        canvas = Canvas()
+        LAYOUTS[state["layout"]](canvas, state)
+        frame = canvas.tobytes()
+        self._frames[etag] = frame
+        while len(self._frames) > self.max_entries:
+            self._frames.popitem(last=False)
+        return etag, frame
+
+    async def get(self, device_id: str, panel_name: str) -> Optional[Tuple[str, bytes]]:
+        """ETag and frame for one of a device's panels, None if it has no frame"""
+        if panel_name not in PANEL_STATES:
+            return None
+        view = config_manager.get_device_view(device_id)
+        panel = (view.config or {}).get("panels", {}).get(panel_name, {})
+        data = await PANEL_FETCHERS[panel_name](panel)
+        return self.render(PANEL_STATES[panel_name](data))
+
+
+# Global frame renderer instance
+frame_renderer = FrameRenderer()
@@ -0,0 +1,50 @@
+import hashlib
+from typing import Optional
+
+from sanic import Request, response
+from sanic.response import HTTPResponse
+
+CACHEABLE_TYPES = (
+    "application/json",
+    "application/msgpack",
+    "application/octet-stream",
+)
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already names this ETag"""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def conditional_response(request: Request, res: HTTPResponse) -> Optional[HTTPResponse]:
+    """Tag a successful JSON/MessagePack/frame GET and answer 304 if the client has it.
+
+    Uses an ETag the handler already set (e.g. one precomputed alongside
+    cached bytes) and only hashes the body otherwise. Returns the 304
+    response to send instead, or None to send res as-is.
+    """
+    if request.method != "GET" or res.status != 200:
+        return None
+    if not (res.content_type or "").startswith(CACHEABLE_TYPES):
+        return None
+    if not isinstance(res.body, bytes):
+        return None
+
+    etag = res.headers.get("ETag")
+    if etag is None:
+        etag = make_etag(res.body)
+        res.headers["ETag"] = etag
+    if etag_matches(request, etag):
+        return response.empty(status=304, headers={"ETag": etag})
+    return None
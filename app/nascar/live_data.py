@@ -1,11 +1,49 @@
-import requests
 import datetime
 from pytz import timezone
+from ..constants import CacheTier
+from ..selection import Selection
+from ..upstream import upstream
 
 EASTERN = timezone("US/Eastern")
 PACIFIC = timezone("US/Pacific")
 LIVE_URL = "https://cf.nascar.com/live/feeds/live-feed.json"
 
+# Race-level fields passed through to clients plus the per-vehicle fields
+# the top-3 payload reads; the rest of each vehicle entry is never built
+LIVE_FEED_SELECTION = Selection(
+    [
+        "lap_number",
+        "elapsed_time",
+        "flag_state",
+        "race_id",
+        "laps_in_race",
+        "laps_to_go",
+        "run_id",
+        "run_name",
+        "run_type",
+        "series_id",
+        "time_of_day",
+        "time_of_day_os",
+        "track_id",
+        "track_length",
+        "track_name",
+        "number_of_caution_segments",
+        "number_of_caution_laps",
+        "number_of_lead_changes",
+        "number_of_leaders",
+        "avg_diff_1to3",
+        "stage",
+        "vehicles.item.running_position",
+        "vehicles.item.laps_completed",
+        "vehicles.item.last_lap_time",
+        "vehicles.item.last_lap_speed",
+        "vehicles.item.vehicle_number",
+        "vehicles.item.driver.first_name",
+        "vehicles.item.driver.last_name",
+        "vehicles.item.driver.full_name",
+    ]
+)
+
 
 def format_datetime_from_eastern_to_pst(dt_str):
     try:
@@ -25,47 +63,47 @@ def clean_last_name(name):
     return name
 
 
-def get_live_race_data():
-    try:
-        response = requests.get(LIVE_URL, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        if not data.get("vehicles"):
-            return None  # No live race data
-
-        # Format time_of_day_os
-        if "time_of_day_os" in data:
-            formatted = format_datetime_from_eastern_to_pst(data["time_of_day_os"][:19])
-            if formatted:
-                data["time_of_day_os_formatted"] = formatted
-
-        top_3 = sorted(data["vehicles"], key=lambda v: v.get("running_position", 999))[
-            :3
-        ]
-        formatted_vehicles = []
-
-        for v in top_3:
-            driver = v.get("driver", {})
-            first = driver.get("first_name", "")
-            last = driver.get("last_name", "")
-            short_name = f"{first[:1]}, {clean_last_name(last)}"
-
-            formatted_vehicles.append(
-                {
-                    "driver_name": driver.get("full_name"),
-                    "short_display_name": short_name,
-                    "position": v.get("running_position"),
-                    "laps_completed": v.get("laps_completed"),
-                    "last_lap_time": v.get("last_lap_time"),
-                    "last_lap_speed": v.get("last_lap_speed"),
-                    "vehicle_number": v.get("vehicle_number"),
-                }
-            )
-
-        data["vehicles"] = formatted_vehicles
-        return data
+def format_live_race_data(feed):
+    """Build the top-3 live payload from a raw live feed"""
+    if not feed.get("vehicles"):
+        return None  # No live race data
 
-    except Exception as e:
-        print(f"[ERROR] Failed to fetch live race feed: {e}")
-        return None
+    # The parsed feed is shared with concurrent callers, so build a copy
+    data = dict(feed)
+
+    # Format time_of_day_os
+    if "time_of_day_os" in data:
+        formatted = format_datetime_from_eastern_to_pst(data["time_of_day_os"][:19])
+        if formatted:
+            data["time_of_day_os_formatted"] = formatted
+
+    top_3 = sorted(data["vehicles"], key=lambda v: v.get("running_position", 999))[:3]
+    formatted_vehicles = []
+
+    for v in top_3:
+        driver = v.get("driver", {})
+        first = driver.get("first_name", "")
+        last = driver.get("last_name", "")
+        short_name = f"{first[:1]}, {clean_last_name(last)}"
+
+        formatted_vehicles.append(
+            {
+                "driver_name": driver.get("full_name"),
+                "short_display_name": short_name,
+                "position": v.get("running_position"),
+                "laps_completed": v.get("laps_completed"),
+                "last_lap_time": v.get("last_lap_time"),
+                "last_lap_speed": v.get("last_lap_speed"),
+                "vehicle_number": v.get("vehicle_number"),
+            }
+        )
+
+    data["vehicles"] = formatted_vehicles
+    return data
+
+
+async def fetch_live_feed():
+    """The live feed, trimmed to LIVE_FEED_SELECTION"""
+    return await upstream.get_json(
+        LIVE_URL, tier=CacheTier.LIVE, select=LIVE_FEED_SELECTION
+    )
@@ -0,0 +1,97 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+from ..constants import NASCAR_LIVE_IDLE_INTERVAL, NASCAR_LIVE_POLL_INTERVAL
+from ..snapshots import live_race_key, snapshot_hub
+from .live_data import fetch_live_feed, format_live_race_data
+from .schedule import ensure_schedule, is_race_window
+
+
+class LiveRaceIngester:
+    """Single background reader of the NASCAR live feed.
+
+    The feed is only polled while the cached schedule has a session on
+    track. A new top-3 payload is built only when the feed has actually
+    moved on (different lap or elapsed time); handlers serve the latest
+    snapshot, which is also published per series to the snapshot hub.
+    """
+
+    def __init__(
+        self,
+        interval: float = NASCAR_LIVE_POLL_INTERVAL,
+        idle_interval: float = NASCAR_LIVE_IDLE_INTERVAL,
+    ):
+        self.interval = interval
+        self.idle_interval = idle_interval
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._signature = None
+        self._series_id: Optional[int] = None
+        self._ingested = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def get_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Latest formatted payload, reading the feed once if never ingested"""
+        if not self._ingested:
+            try:
+                await self.ingest()
+            except Exception as e:
+                print(f"[ERROR] Failed to fetch live race feed: {e}")
+        return self._snapshot
+
+    async def ingest(self) -> bool:
+        """Read the feed and rebuild the snapshot if it changed"""
+        feed = await fetch_live_feed()
+        self._ingested = True
+        signature = (
+            feed.get("race_id"),
+            feed.get("run_id"),
+            feed.get("lap_number"),
+            feed.get("elapsed_time"),
+        )
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        self._snapshot = format_live_race_data(feed)
+        self._publish(feed.get("series_id"))
+        return True
+
+    def _publish(self, series_id: Optional[int]):
+        self._snapshot = snapshot_hub.publish(live_race_key(), self._snapshot)
+        if self._series_id is not None and self._series_id != series_id:
+            # The previous series is no longer on track
+            snapshot_hub.publish(live_race_key(self._series_id), None)
+        if series_id is not None:
+            snapshot_hub.publish(live_race_key(series_id), self._snapshot)
+        self._series_id = series_id
+
+    async def _in_race_window(self) -> bool:
+        schedule = await ensure_schedule()
+        return bool(schedule) and is_race_window(schedule)
+
+    async def run(self):
+        while True:
+            delay = self.idle_interval
+            try:
+                if await self._in_race_window():
+                    delay = self.interval
+                    await self.ingest()
+            except Exception as e:
+                print(f"[ERROR] Live race ingest failed: {e}")
+            await asyncio.sleep(delay)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global live race ingester instance
+live_race_ingester = LiveRaceIngester()
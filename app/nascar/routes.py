@@ -1,57 +1,77 @@
 from sanic import Blueprint, response
-from .live_data import get_live_race_data
-from .schedule import get_schedule_for_series, get_last_race_for_series
-from .standings import get_last_completed_race_id, fetch_standings
+from ..compact import compact_response, wants_compact
+from ..constants import CompactKind
+from ..projection import projected_json
+from ..snapshots import live_race_key, long_poll, push_snapshots
+from .live_ingester import live_race_ingester
+from .schedule import get_upcoming_race_for_series
+from .standings import (
+    fetch_standings,
+    get_last_completed_race_id,
+    get_last_race_with_winner,
+)
 
 nascar_bp = Blueprint("nascar", url_prefix="/nascar")
 
 
 @nascar_bp.get("/race/<series_id:int>")
 async def get_upcoming_race(request, series_id):
-    races = get_schedule_for_series(series_id)
-    for race in races:
-        if race.get("is_today_race") or race.get("is_next_race"):
-            return response.json(race)
+    race = await get_upcoming_race_for_series(series_id)
+    if race:
+        return projected_json(request, race)
     return response.json({"error": "No upcoming race found"}, status=404)
 
 
 @nascar_bp.get("/race/live")
 async def get_live_race(request):
-    data = get_live_race_data()
+    data = await live_race_ingester.get_snapshot()
+    if data and wants_compact(request):
+        return compact_response(CompactKind.LIVE_RACE, data)
     if data:
-        return response.json(data)
+        return projected_json(request, data, shared=True)
     return response.json({"error": "No live race found"}, status=404)
 
 
+@nascar_bp.get("/race/live/wait")
+async def wait_for_live_race(request):
+    """Long-poll the live race: answer once it changes past ?version=
+
+    ?series= limits it to one series' race.
+    """
+    await live_race_ingester.get_snapshot()
+    series_id = request.args.get("series")
+    key = live_race_key(int(series_id) if series_id and series_id.isdigit() else None)
+    return await long_poll(request, key)
+
+
 @nascar_bp.get("/race/last/<series_id:int>")
 async def get_last_race(request, series_id):
-    race = get_last_race_for_series(series_id)
+    race = await get_last_race_with_winner(series_id)
     if not race:
         return response.json({"error": "No past race found"}, status=404)
-
-    winner_id = race.get("winner_driver_id")
-    if winner_id:
-        race_id = race.get("race_id")
-        standings = fetch_standings(series_id, race_id)
-        if standings:
-            for driver in standings:
-                if driver.get("driver_id") == winner_id:
-                    first = driver.get("first_name", "")
-                    last = driver.get("last_name", "")
-                    race["winner_name"] = f"{first} {last}"
-                    break
-
-    return response.json(race)
+    return projected_json(request, race)
 
 
 @nascar_bp.get("/standings/<series_id:int>")
 async def get_series_standings(request, series_id):
-    race_id = get_last_completed_race_id(series_id)
+    race_id = await get_last_completed_race_id(series_id)
     if not race_id:
         return response.json({"error": "No completed race found"}, status=404)
 
-    standings = fetch_standings(series_id, race_id, 10)
+    standings = await fetch_standings(series_id, race_id, 10)
     if standings is None:
         return response.json({"error": "Failed to fetch standings"}, status=502)
 
-    return response.json(standings)
+    return projected_json(request, standings)
+
+
+@nascar_bp.websocket("/ws/race/live")
+async def live_race_ws(request, ws):
+    """Push the live race top 3 whenever it changes"""
+    await push_snapshots(ws, live_race_key(), live_race_ingester.get_snapshot)
+
+
+@nascar_bp.websocket("/ws/race/<series_id:int>")
+async def series_live_race_ws(request, ws, series_id):
+    """Push the live race top 3 while the series is on track"""
+    await push_snapshots(ws, live_race_key(series_id), live_race_ingester.get_snapshot)
@@ -1,11 +1,15 @@
 import os
-import json
-import requests
 import datetime
+from bisect import bisect_left, bisect_right
 from pytz import timezone
+from .. import serialization
+from ..cache import response_cache
+from ..constants import CacheTier, RACE_WINDOW_AFTER, RACE_WINDOW_BEFORE
+from ..upstream import upstream
 
 EASTERN = timezone("US/Eastern")
 PACIFIC = timezone("US/Pacific")
+UTC = timezone("UTC")
 YEAR = "2025"
 URL = f"https://cf.nascar.com/cacher/{YEAR}/race_list_basic.json"
 CACHE_FILE = os.path.join("data", "schedule.json")
@@ -22,7 +26,9 @@ def format_datetime_from_eastern_to_pst(dt_str):
         return None
 
 
-def add_formatted_dates_to_race(race):
+def with_formatted_dates(race):
+    """Copy of a race with Pacific display strings added for its dates"""
+    race = dict(race)
     fields = ["date_scheduled", "race_date", "qualifying_date", "tunein_date"]
     for field in fields:
         if field in race and race[field]:
@@ -31,22 +37,30 @@ def add_formatted_dates_to_race(race):
                 race[f"{field}_formatted"] = formatted
 
     if "schedule" in race:
+        events = []
         for event in race["schedule"]:
             start_time = event.get("start_time_utc")
-            if start_time:
-                formatted = format_datetime_from_eastern_to_pst(start_time)
-                if formatted:
-                    event["start_time_utc_formatted"] = formatted
+            formatted = (
+                format_datetime_from_eastern_to_pst(start_time) if start_time else None
+            )
+            if formatted:
+                event = {**event, "start_time_utc_formatted": formatted}
+            events.append(event)
+        race["schedule"] = events
+    return race
 
 
-def fetch_and_cache_schedule():
+async def fetch_and_cache_schedule():
     try:
-        response = requests.get(URL, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        previous = response_cache.peek(URL)
+        data = await upstream.get_json(URL, tier=CacheTier.SCHEDULE)
+        if previous is not None and data is previous.value:
+            # 304 Not Modified: the disk copy is current, just mark it fresh
+            if os.path.exists(CACHE_FILE):
+                os.utime(CACHE_FILE)
+                return data
         os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f)
+        serialization.write_file(CACHE_FILE, data)
         return data
     except Exception as e:
         print(f"[ERROR] Fetch failed: {e}")
@@ -56,27 +70,142 @@ def fetch_and_cache_schedule():
 def load_cached_schedule():
     if not os.path.exists(CACHE_FILE):
         return None
-    with open(CACHE_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return serialization.read_file(CACHE_FILE)
 
 
-def is_data_stale(schedule_data):
-    now = datetime.datetime.now(tz=PACIFIC)
-    for races in schedule_data.values():
+def parse_race_start(race):
+    """A race's start as an aware Eastern datetime, or None"""
+    try:
+        return EASTERN.localize(datetime.datetime.fromisoformat(race["race_date"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def get_session_start_times(race):
+    """Start times of a race and its on-track sessions (practice, qualifying)"""
+    starts = []
+    race_start = parse_race_start(race)
+    if race_start is not None:
+        starts.append(race_start)
+    for event in race.get("schedule", []):
+        if not event.get("run_type"):
+            continue  # Meetings, garage hours and other off-track events
+        try:
+            starts.append(
+                UTC.localize(datetime.datetime.fromisoformat(event["start_time_utc"]))
+            )
+        except (KeyError, TypeError, ValueError):
+            continue
+    return starts
+
+
+class SeriesSchedule:
+    """One series' races sorted by start, with parallel lists for bisect.
+
+    days holds each race's calendar date as scheduled (Eastern), which is
+    what the today/next/last lookups compare against Pacific today. Races
+    are stored with their formatted dates already added, so lookups only
+    copy them.
+    """
+
+    def __init__(self, races):
+        entries = []
         for race in races:
-            date_str = race.get("race_date") or race.get("date_scheduled")
-            try:
-                race_time = datetime.datetime.fromisoformat(date_str)
-                if race_time > now:
-                    return False
-            except:
-                continue
-    return True
+            start = parse_race_start(race)
+            if start is not None:
+                entries.append((start, with_formatted_dates(race)))
+        entries.sort(key=lambda entry: entry[0])
+        self.starts = [start for start, _ in entries]
+        self.days = [start.date() for start in self.starts]
+        self.races = [race for _, race in entries]
+
+    def today(self, day: datetime.date):
+        i = bisect_left(self.days, day)
+        if i < len(self.days) and self.days[i] == day:
+            return self.races[i]
+        return None
+
+    def next_after(self, day: datetime.date):
+        i = bisect_right(self.days, day)
+        return self.races[i] if i < len(self.races) else None
+
+    def last_before(self, day: datetime.date):
+        i = bisect_left(self.days, day)
+        return self.races[i - 1] if i else None
+
+    def last_started(self, now: datetime.datetime):
+        i = bisect_right(self.starts, now)
+        return self.races[i - 1] if i else None
+
+
+class ScheduleIndex:
+    """A schedule payload indexed by series, plus every on-track session start.
+
+    Built once per payload (see index_schedule) so lookups don't re-sort or
+    re-parse the schedule on every request.
+    """
+
+    def __init__(self, schedule_data):
+        self.source = schedule_data
+        self.series = {
+            key: SeriesSchedule(races) for key, races in schedule_data.items()
+        }
+        self.sessions = sorted(
+            start
+            for races in schedule_data.values()
+            for race in races
+            for start in get_session_start_times(race)
+        )
+        self.last_start = max(
+            (series.starts[-1] for series in self.series.values() if series.starts),
+            default=None,
+        )
+
+    def for_series(self, series_id: int) -> SeriesSchedule:
+        return self.series.get(f"series_{series_id}") or SeriesSchedule([])
+
+    def is_stale(self, now: datetime.datetime) -> bool:
+        """Whether every race in the schedule has already started"""
+        return self.last_start is None or self.last_start <= now
+
+    def in_race_window(self, now: datetime.datetime) -> bool:
+        before = datetime.timedelta(seconds=RACE_WINDOW_BEFORE)
+        after = datetime.timedelta(seconds=RACE_WINDOW_AFTER)
+        i = bisect_left(self.sessions, now - after)
+        return i < len(self.sessions) and self.sessions[i] <= now + before
+
+
+_index = None
 
 
-def ensure_schedule():
+def index_schedule(schedule_data) -> ScheduleIndex:
+    """Index for a schedule payload, rebuilt only when the payload changes"""
+    global _index
+    if _index is None or _index.source is not schedule_data:
+        _index = ScheduleIndex(schedule_data)
+    return _index
+
+
+def is_data_stale(schedule_data):
+    return index_schedule(schedule_data).is_stale(datetime.datetime.now(tz=PACIFIC))
+
+
+def is_race_window(schedule_data, now=None):
+    """Whether any series has a session on track around now"""
+    now = now or datetime.datetime.now(tz=PACIFIC)
+    return index_schedule(schedule_data).in_race_window(now)
+
+
+async def ensure_schedule():
+    cached = response_cache.get(URL)
+    if cached is not None:
+        return cached
+    stale = response_cache.peek(URL)
+    if stale is not None and stale.has_validators():
+        # Revalidate the copy we hold rather than re-reading the disk cache
+        return await fetch_and_cache_schedule()
     if not os.path.exists(CACHE_FILE):
-        return fetch_and_cache_schedule()
+        return await fetch_and_cache_schedule()
     mtime = os.path.getmtime(CACHE_FILE)
     file_age = (
         datetime.datetime.now(tz=PACIFIC)
@@ -84,92 +213,61 @@ def ensure_schedule():
     ).total_seconds()
     cached = load_cached_schedule()
     if file_age > 86400 or is_data_stale(cached):
-        return fetch_and_cache_schedule()
+        return await fetch_and_cache_schedule()
+    response_cache.set(URL, cached, CacheTier.SCHEDULE)
     return cached
 
 
-def get_schedule_for_series(series_id):
-    data = ensure_schedule()
-    if not data:
-        return []
-
-    series_key = f"series_{series_id}"
-    races = sorted(data.get(series_key, []), key=lambda r: r.get("race_date", ""))
-    today = datetime.datetime.now(tz=PACIFIC).date()
+async def get_schedule_index():
+    data = await ensure_schedule()
+    return index_schedule(data) if data else None
 
-    next_race = None
-    min_future_diff = None
 
-    for race in races:
-        race["is_today_race"] = False
-        race["is_next_race"] = False
-
-        try:
-            race_date = datetime.datetime.fromisoformat(race["race_date"]).date()
-        except:
-            continue
+async def get_schedule_for_series(series_id):
+    index = await get_schedule_index()
+    if not index:
+        return []
 
-        add_formatted_dates_to_race(race)
+    series = index.for_series(series_id)
+    today = datetime.datetime.now(tz=PACIFIC).date()
 
-        if race_date == today:
-            race["is_today_race"] = True
-            return [race]
-        elif race_date > today:
-            diff = (race_date - today).days
-            if min_future_diff is None or diff < min_future_diff:
-                next_race = race
-                min_future_diff = diff
+    # Indexed races are shared, so the flags go on copies
+    race = series.today(today)
+    if race:
+        race = {**race, "is_today_race": True, "is_next_race": False}
+    else:
+        race = series.next_after(today)
+        if not race:
+            return []
+        race = {**race, "is_today_race": False, "is_next_race": True}
+    return [race]
 
-    if next_race:
-        next_race["is_next_race"] = True
-        return [next_race]
 
-    return []
+async def get_upcoming_race_for_series(series_id):
+    """Today's race for a series, else its next one"""
+    races = await get_schedule_for_series(series_id)
+    return races[0] if races else None
 
 
-def get_last_race_for_series(series_id):
-    data = ensure_schedule()
-    if not data:
+async def get_last_race_for_series(series_id):
+    index = await get_schedule_index()
+    if not index:
         return None
 
-    series_key = f"series_{series_id}"
-    races = sorted(
-        data.get(series_key, []), key=lambda r: r.get("race_date", ""), reverse=True
-    )
     today = datetime.datetime.now(tz=PACIFIC).date()
-
-    for race in races:
-        try:
-            race_date = datetime.datetime.fromisoformat(race["race_date"]).date()
-        except:
-            continue
-
-        if race_date < today:
-            add_formatted_dates_to_race(race)
-            race["is_last_race"] = True
-            return race
-
-    return None
+    race = index.for_series(series_id).last_before(today)
+    if not race:
+        return None
+    return {**race, "is_last_race": True}
 
 
-def get_last_completed_race(series_id):
-    data = ensure_schedule()
-    if not data:
+async def get_last_completed_race(series_id):
+    index = await get_schedule_index()
+    if not index:
         return None
 
-    series_key = f"series_{series_id}"
-    races = sorted(
-        data.get(series_key, []), key=lambda r: r.get("race_date", ""), reverse=True
-    )
     now = datetime.datetime.now(tz=PACIFIC)
-
-    for race in races:
-        try:
-            race_time = datetime.datetime.fromisoformat(race["race_date"])
-            if race_time <= now:
-                add_formatted_dates_to_race(race)
-                race["is_last_race"] = True
-                return race
-        except:
-            continue
-    return None
+    race = index.for_series(series_id).last_started(now)
+    if not race:
+        return None
+    return {**race, "is_last_race": True}
@@ -1,21 +1,39 @@
-import requests
+from ..constants import CacheTier
+from ..upstream import upstream
 from .schedule import get_last_race_for_series
 
 
-def get_last_completed_race_id(series_id: int):
-    race = get_last_race_for_series(series_id)
+async def get_last_completed_race_id(series_id: int):
+    race = await get_last_race_for_series(series_id)
     if race and isinstance(race, dict):
         return race.get("race_id")
     return None
 
 
-def fetch_standings(series_id: int, race_id: int, limit: int = None):
+async def fetch_standings(series_id: int, race_id: int, limit: int = None):
     url = f"https://cf.nascar.com/live/feeds/series_{series_id}/{race_id}/live_points.json"
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        # Only requested for completed races, whose points never change
+        data = await upstream.get_json(url, tier=CacheTier.FINAL)
         return data[:limit] if limit else data
     except Exception as e:
         print(f"[Standings] Error: {e}")
         return None
+
+
+async def get_last_race_with_winner(series_id: int):
+    """Last race for a series with the winner's name added from its results"""
+    race = await get_last_race_for_series(series_id)
+    if not race:
+        return None
+
+    winner_id = race.get("winner_driver_id")
+    if winner_id:
+        standings = await fetch_standings(series_id, race.get("race_id"))
+        for driver in standings or []:
+            if driver.get("driver_id") == winner_id:
+                first = driver.get("first_name", "")
+                last = driver.get("last_name", "")
+                # The schedule entry is shared, so add the name to a copy
+                return {**race, "winner_name": f"{first} {last}"}
+    return race
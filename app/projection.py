@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from sanic import Request, response
+from sanic.response import HTTPResponse
+
+from .config_manager import config_manager
+from .constants import PROJECTION_CACHE_SIZE, PROJECTION_ENCODED_PER_FIELDS
+
+
+class Projection:
+    """A compiled ?fields= selection of dotted paths.
+
+    Each path keeps one value ("teams.home.team.name"); lists along a path
+    are projected item by item. Encoded results for shared, never-mutated
+    payloads are cached per object so repeat polls skip both the projection
+    and the encode.
+    """
+
+    def __init__(self, fields: FrozenSet[str]):
+        self.fields = fields
+        # Nested key -> subtree, or None to keep the whole value
+        self.tree: Dict[str, Any] = {}
+        for path in sorted(fields, key=lambda f: f.count(".")):
+            node = self.tree
+            parts = path.split(".")
+            for part in parts[:-1]:
+                if part in node and node[part] is None:
+                    break  # An ancestor is already kept whole
+                node = node.setdefault(part, {})
+            else:
+                node[parts[-1]] = None
+        self._encoded: "OrderedDict[Tuple[int, str], Tuple[Any, bytes]]" = OrderedDict()
+
+    def apply(self, value: Any, tree: Optional[Dict[str, Any]] = None) -> Any:
+        tree = self.tree if tree is None else tree
+        if isinstance(value, list):
+            return [self.apply(item, tree) for item in value]
+        if not isinstance(value, dict):
+            return value
+        projected = {}
+        for key, item in value.items():
+            if key in tree:
+                subtree = tree[key]
+                projected[key] = item if subtree is None else self.apply(item, subtree)
+        return projected
+
+    def encode(self, value: Any, shared: bool = False) -> bytes:
+        """JSON bytes of the projected value (with status merged in).
+
+        Pass shared=True only for payloads that are replaced rather than
+        mutated; their bytes are cached by object identity and display mode.
+        """
+        if not shared:
+            return config_manager.encode(self.apply(value))
+
+        key = (id(value), config_manager.get_mode())
+        hit = self._encoded.get(key)
+        # Holding the value keeps its id from being reused while cached
+        if hit is not None and hit[0] is value:
+            self._encoded.move_to_end(key)
+            return hit[1]
+        body = config_manager.encode(self.apply(value))
+        self._encoded[key] = (value, body)
+        if len(self._encoded) > PROJECTION_ENCODED_PER_FIELDS:
+            self._encoded.popitem(last=False)
+        return body
+
+
+@lru_cache(maxsize=PROJECTION_CACHE_SIZE)
+def _compile(fields: FrozenSet[str]) -> Projection:
+    return Projection(fields)
+
+
+def compile_fields(spec: str) -> Optional[Projection]:
+    """Projection for a comma-separated field list, or None if it's empty"""
+    fields = frozenset(f.strip() for f in spec.split(",") if f.strip())
+    return _compile(fields) if fields else None
+
+
+def projected_json(request: Request, data: Any, shared: bool = False) -> HTTPResponse:
+    """JSON response for data, trimmed to the request's ?fields= if given"""
+    spec = request.args.get("fields")
+    projection = compile_fields(spec) if spec else None
+    if projection is None:
+        return response.json(data)
+    return response.raw(
+        projection.encode(data, shared=shared), content_type="application/json"
+    )
@@ -3,8 +3,11 @@ import json
 import time
 import psutil
 from datetime import datetime
+from .bundle import frame_bundler
+from .compact import compact_response, wants_compact
 from .config_manager import config_manager
-from .constants import DisplayMode, PanelPriority, PanelStatus, ApiStatus
+from .frames import frame_renderer
+from .constants import DisplayMode, PanelPriority, ApiStatus, CompactKind
 
 index_bp = Blueprint("index", url_prefix="/")
 
@@ -634,42 +637,58 @@ async def save_config(request: Request):
 async def get_config(request: Request):
     """Get full configuration"""
     device_id = request.args.get("device", "baseball_1")
-    return response.json(config_manager.get_device_config(device_id))
+    view = config_manager.get_device_view(device_id)
+    if wants_compact(request):
+        return compact_response(CompactKind.CONFIG, view.config or {})
+    return response.raw(
+        view.config_body,
+        content_type="application/json",
+        headers={"ETag": view.config_etag},
+    )
+
+
+@index_bp.get("/bundle")
+async def get_bundle(request: Request):
+    """Get the data for every enabled panel of a device in one response"""
+    device_id = request.args.get("device") or get_device_id(request)
+    body = await frame_bundler.get(device_id)
+    return response.raw(body, content_type="application/json")
+
+
+@index_bp.get("/frame/<panel_name>")
+async def get_frame(request: Request, panel_name: str):
+    """Get a panel rendered as a 64x64 RGB565 frame, ready to blit"""
+    device_id = request.args.get("device") or get_device_id(request)
+    frame = await frame_renderer.get(device_id, panel_name)
+    if frame is None:
+        return response.json({"error": "No frame for this panel"}, status=404)
+    etag, body = frame
+    return response.raw(
+        body,
+        content_type="application/octet-stream",
+        headers={"ETag": etag, "X-Frame-Format": "rgb565le;64x64"},
+    )
 
 
 @index_bp.get("/status/panels")
 async def get_panel_status(request: Request):
     """Get real-time panel status"""
     device_id = request.args.get("device", "baseball_1")
-    config = config_manager.get_device_config(device_id)
+    view = config_manager.get_device_view(device_id)
     # This would normally check actual panel states
-    # For now, return mock data
-    panels = config.get("panels", {})
-
-    panel_status = {}
-    for panel_name, panel_config in panels.items():
-        panel_status[panel_name] = {
-            "has_live_content": panel_name
-            in ["baseball", "nascar"],  # Mock live content detection
-            "last_update": datetime.utcnow().isoformat() + "Z",
-            "status": PanelStatus.ACTIVE.value
-            if panel_config.get("enabled", True)
-            else PanelStatus.DISABLED.value,
-            "current_sub_panel": "live_game"
-            if panel_name == "baseball"
-            else "cup_races"
-            if panel_name == "nascar"
-            else "system_status",
-        }
-
-    return response.json(panel_status)
+    # For now, return mock data stamped with when the device's view was built
+    return response.raw(
+        view.panels_body,
+        content_type="application/json",
+        headers={"ETag": view.panels_etag},
+    )
 
 
 @index_bp.get("/status/system")
 async def get_system_status(request: Request):
     """Get system health and performance metrics"""
     device_id = request.args.get("device", "baseball_1")
-    config = config_manager.get_device_config(device_id)
+    view = config_manager.get_device_view(device_id)
     try:
         # Get system metrics
         memory = psutil.virtual_memory()
@@ -678,7 +697,7 @@ async def get_system_status(request: Request):
         system_status = {
             "api_status": ApiStatus.HEALTHY.value,
             "last_config_fetch": datetime.utcnow().isoformat() + "Z",
-            "active_mode": config.get("mode", "auto"),
+            "active_mode": view.mode,
             "current_panel": "baseball",  # Mock current panel
             "uptime_seconds": int(time.time()),  # Mock uptime
             "memory_usage_percent": round(memory.percent, 1),
@@ -699,9 +718,11 @@ async def get_system_status(request: Request):
 async def get_status(request: Request):
     """Legacy status endpoint for backward compatibility"""
     device_id = request.args.get("device", "baseball_1")
-    config = config_manager.get_device_config(device_id)
-    return response.json(
-        {"mode": config.get("mode", "auto"), "status": config.get("mode", "auto")}
+    view = config_manager.get_device_view(device_id)
+    return response.raw(
+        view.status_body,
+        content_type="application/json",
+        headers={"ETag": view.status_etag},
     )
 
 
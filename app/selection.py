@@ -0,0 +1,170 @@
+from typing import Any, AsyncIterator, Iterable, List, Optional
+
+from . import serialization
+from .constants import STREAM_PARSE_THRESHOLD
+
+try:
+    import ijson
+except ImportError:  # Optional: falls back to a full parse plus projection
+    ijson = None
+
+
+class Selection:
+    """A set of JSON sub-trees a consumer actually reads.
+
+    Paths use ijson prefix syntax: dotted object keys, with ``item`` standing
+    for every element of an array (``vehicles.item.driver``). Everything on
+    the way to a selected path is kept as a bare container; anything outside
+    is never built.
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths = frozenset(paths)
+        self.ancestors = {""}
+        for path in self.paths:
+            parts = path.split(".")
+            for i in range(1, len(parts)):
+                self.ancestors.add(".".join(parts[:i]))
+        self.key = ",".join(sorted(self.paths))
+
+    def contains(self, prefix: str) -> bool:
+        """Whether prefix is a selected path or lies inside one"""
+        if prefix in self.paths:
+            return True
+        while "." in prefix:
+            prefix = prefix.rsplit(".", 1)[0]
+            if prefix in self.paths:
+                return True
+        return False
+
+    def is_ancestor(self, prefix: str) -> bool:
+        return prefix in self.ancestors
+
+    def project(self, value: Any, prefix: str = "") -> Any:
+        """Trim an already parsed value (found at prefix) to the selection"""
+        if self.contains(prefix):
+            return value
+        child = f"{prefix}." if prefix else ""
+        if isinstance(value, dict):
+            return {
+                k: self.project(v, child + k)
+                for k, v in value.items()
+                if self.contains(child + k) or self.is_ancestor(child + k)
+            }
+        if isinstance(value, list):
+            item = child + "item"
+            if not (self.contains(item) or self.is_ancestor(item)):
+                return []
+            return [self.project(v, item) for v in value]
+        return value
+
+    async def parse_stream(self, chunks: AsyncIterator[bytes]) -> Any:
+        """Parse a streamed JSON body, building only the selected sub-trees.
+
+        Bodies up to STREAM_PARSE_THRESHOLD bytes are decoded in one go and
+        projected, which is several times faster than walking ijson events in
+        Python. Larger ones switch to the event stream so the full document
+        is never held in memory.
+        """
+        chunks = chunks.__aiter__()
+        buffered: List[bytes] = []
+        size = 0
+        async for chunk in chunks:
+            buffered.append(chunk)
+            size += len(chunk)
+            if size > STREAM_PARSE_THRESHOLD and ijson is not None:
+                break
+        else:
+            return self.project(serialization.loads(b"".join(buffered)))
+
+        builder = _SelectiveBuilder(self)
+        async for prefix, event, value in ijson.parse_async(
+            _AsyncChunkReader(_replay(buffered, chunks)), use_float=True
+        ):
+            builder.event(prefix, event, value)
+        return builder.root
+
+
+async def _replay(
+    buffered: List[bytes], rest: AsyncIterator[bytes]
+) -> AsyncIterator[bytes]:
+    """The chunks already read, then the remainder of the stream"""
+    while buffered:
+        yield buffered.pop(0)
+    async for chunk in rest:
+        yield chunk
+
+
+class _AsyncChunkReader:
+    """Minimal async file-like wrapper ijson can read a byte stream from"""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            return b""  # ijson probes the stream type with an empty read
+        # An empty chunk would read as end of stream, so skip any
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+
+class _SelectiveBuilder:
+    def __init__(self, selection: Selection):
+        self.selection = selection
+        self.root: Any = None
+        # Frames of [container, keep everything below, pending map key]
+        self._stack: List[list] = []
+        self._skip_depth = 0
+
+    def event(self, prefix: str, event: str, value: Any):
+        if self._skip_depth:
+            if event in ("start_map", "start_array"):
+                self._skip_depth += 1
+            elif event in ("end_map", "end_array"):
+                self._skip_depth -= 1
+            return
+        if event == "map_key":
+            self._stack[-1][2] = value
+            return
+        if event in ("end_map", "end_array"):
+            self._stack.pop()
+            return
+
+        keep_all = bool(self._stack) and self._stack[-1][1]
+        if not keep_all:
+            keep_all = self.selection.contains(prefix)
+            if not keep_all and not self.selection.is_ancestor(prefix):
+                if event in ("start_map", "start_array"):
+                    self._skip_depth = 1
+                return
+
+        if event == "start_map":
+            value = {}
+        elif event == "start_array":
+            value = []
+        self._attach(value)
+        if event in ("start_map", "start_array"):
+            self._stack.append([value, keep_all, None])
+
+    def _attach(self, value: Any):
+        if not self._stack:
+            self.root = value
+            return
+        container, _, key = self._stack[-1]
+        if isinstance(container, list):
+            container.append(value)
+        else:
+            container[key] = value
+
+
+def pointer_prefix(path: str) -> Optional[str]:
+    """Convert a JSON Pointer to a selection prefix (array indices -> item)"""
+    if path == "":
+        return ""
+    if not path.startswith("/"):
+        return None
+    tokens = [t.replace("~1", "/").replace("~0", "~") for t in path[1:].split("/")]
+    return ".".join("item" if t.isdigit() or t == "-" else t for t in tokens)
@@ -0,0 +1,148 @@
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Union
+
+from .constants import JSON_BACKEND, JsonBackend
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON backend
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # Optional: faster JSON backend
+    msgspec = None
+
+try:
+    import msgpack
+except ImportError:  # Optional: MessagePack for compact device payloads
+    msgpack = None
+
+
+class JsonSerializer:
+    """Stdlib json encoder/decoder; the fallback every install has.
+
+    dumps returns compact UTF-8 bytes (or two-space indented bytes for data
+    files) and loads accepts bytes or str, raising ValueError on malformed
+    input, so backends are interchangeable.
+    """
+
+    backend = JsonBackend.STDLIB
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        if indent:
+            return json.dumps(obj, indent=2).encode()
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def read_file(self, path: Union[str, Path]) -> Any:
+        with open(path, "rb") as f:
+            return self.loads(f.read())
+
+    def write_file(self, path: Union[str, Path], obj: Any, indent: bool = False):
+        atomic_write(path, self.dumps(obj, indent=indent))
+
+
+class OrjsonSerializer(JsonSerializer):
+    backend = JsonBackend.ORJSON
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecSerializer(JsonSerializer):
+    backend = JsonBackend.MSGSPEC
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        data = self._encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if indent else data
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+
+def _file_mode(path: Union[str, Path]) -> int:
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write(path: Union[str, Path], data: bytes):
+    """Replace path with data so readers see the old or new file, never half"""
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; keep the mode a plain write would have
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def msgpack_available() -> bool:
+    return msgspec is not None or msgpack is not None
+
+
+def msgpack_dumps(obj: Any) -> bytes:
+    """Encode obj as MessagePack with msgspec or msgpack, whichever is installed"""
+    if msgspec is not None:
+        return msgspec.msgpack.encode(obj)
+    if msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    raise RuntimeError("MessagePack encoding needs msgspec or msgpack installed")
+
+
+def get_serializer(backend: str = JSON_BACKEND) -> JsonSerializer:
+    """Serializer for a backend name, falling back to stdlib json.
+
+    "auto" takes the fastest installed backend; naming one that isn't
+    installed logs a warning and uses the stdlib.
+    """
+    try:
+        backend = JsonBackend(backend)
+    except ValueError:
+        print(f"[WARN] Unknown JSON backend {backend!r}, using json")
+        return JsonSerializer()
+
+    if backend in (JsonBackend.AUTO, JsonBackend.ORJSON) and orjson is not None:
+        return OrjsonSerializer()
+    if backend in (JsonBackend.AUTO, JsonBackend.MSGSPEC) and msgspec is not None:
+        return MsgspecSerializer()
+    if backend not in (JsonBackend.AUTO, JsonBackend.STDLIB):
+        print(f"[WARN] JSON backend {backend.value} is not installed, using json")
+    return JsonSerializer()
+
+
+# Global serializer instance
+serializer = get_serializer()
+dumps = serializer.dumps
+loads = serializer.loads
+read_file = serializer.read_file
+write_file = serializer.write_file
@@ -1,12 +1,25 @@
 from sanic import Sanic
 from app.nascar.routes import nascar_bp
 from app.baseball.routes import baseball_bp
+from app.baseball.live_poller import live_game_poller
+from app.baseball.teams import refresh_teams
+from app.nascar.live_ingester import live_race_ingester
 from app.routes import index_bp
-import json
 from app.config_manager import config_manager
+from app.http_cache import conditional_response
+from app.upstream import upstream
 
 
-app = Sanic("SportsAPI")
+def dumps_with_status(body, **kwargs):
+    """Encode a JSON response body with the current display mode merged in.
+
+    Installed as the app-wide JSON encoder so status is added before the
+    single serialization pass instead of re-parsing every response body.
+    """
+    return config_manager.encode(body)
+
+
+app = Sanic("SportsAPI", dumps=dumps_with_status)
 
 # Register blueprints
 app.blueprint(nascar_bp)
@@ -14,15 +27,26 @@ app.blueprint(baseball_bp)
 app.blueprint(index_bp)
 
 
-# Middleware to inject status into JSON responses
+# Tag JSON responses and answer repeat polls with 304 Not Modified
 @app.middleware("response")
-async def inject_status(request, res):
-    if res.content_type == "application/json" and isinstance(res.body, bytes):
-        try:
-            data = json.loads(res.body)
-            mode = config_manager.get_mode()
-            data["status"] = mode
-            res.body = json.dumps(data).encode()
-            res.headers["Content-Length"] = str(len(res.body))
-        except Exception:
-            pass
+async def etag_responses(request, res):
+    return conditional_response(request, res)
+
+
+@app.after_server_start
+async def start_pollers(app, loop):
+    app.add_task(refresh_teams())
+    live_game_poller.start()
+    live_race_ingester.start()
+
+
+@app.before_server_stop
+async def stop_pollers(app, loop):
+    await live_game_poller.stop()
+    await live_race_ingester.stop()
+    await config_manager.flush()
+
+
+@app.after_server_stop
+async def close_upstream(app, loop):
+    await upstream.close()
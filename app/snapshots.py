@@ -0,0 +1,167 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sanic import Request, response
+from sanic.response import HTTPResponse
+
+from .config_manager import config_manager
+from .constants import LONG_POLL_MAX_TIMEOUT, LONG_POLL_TIMEOUT, PUSH_RETRACK_INTERVAL
+
+
+def live_game_key(team_id: int) -> str:
+    return f"baseball:{team_id}"
+
+
+def live_race_key(series_id: Optional[int] = None) -> str:
+    """Key for the live race of a series, or whatever race is live"""
+    return f"nascar:{series_id if series_id is not None else 'live'}"
+
+
+class Snapshot:
+    """One published version of a computed payload.
+
+    message is the pushed/long-polled body, {"version": n, "data": payload},
+    encoded once and shared by every subscriber.
+    """
+
+    __slots__ = ("version", "payload", "message")
+
+    def __init__(self, version: int, payload: Any):
+        self.version = version
+        self.payload = payload
+        self.message = config_manager.encode({"version": version, "data": payload})
+
+
+class SnapshotHub:
+    """Latest payload per subscription key, with change notification.
+
+    Background refreshers publish what they computed; the version only
+    advances when the payload actually changed. Waiters block on an
+    asyncio.Event that is set and replaced on every new version.
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._changed: Dict[str, asyncio.Event] = {}
+
+    def get(self, key: str) -> Optional[Snapshot]:
+        return self._snapshots.get(key)
+
+    def publish(self, key: str, payload: Any) -> Any:
+        """Store payload under key if it changed; returns the current payload.
+
+        An equal payload keeps the existing snapshot (and object), so callers
+        can hold on to the returned value to keep identity-keyed caches warm.
+        """
+        current = self._snapshots.get(key)
+        if current is not None and current.payload == payload:
+            return current.payload
+        version = current.version + 1 if current is not None else 1
+        self._store(key, Snapshot(version, payload))
+        return payload
+
+    def restamp(self):
+        """Re-encode every snapshot under a new version.
+
+        Messages carry the display mode, so a mode change is pushed to
+        subscribers even when the data itself hasn't changed.
+        """
+        for key, current in list(self._snapshots.items()):
+            self._store(key, Snapshot(current.version + 1, current.payload))
+
+    def _store(self, key: str, snapshot: Snapshot):
+        self._snapshots[key] = snapshot
+        event = self._changed.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def ensure(self, key: str) -> Snapshot:
+        """Current snapshot, recording "nothing yet" (None) if key has none"""
+        if key not in self._snapshots:
+            self.publish(key, None)
+        return self._snapshots[key]
+
+    async def wait(
+        self, key: str, version: Optional[int], timeout: float
+    ) -> Optional[Snapshot]:
+        """Snapshot newer than version, or the current one after timeout.
+
+        A version the hub doesn't have (e.g. from before a restart) counts as
+        out of date and returns immediately.
+        """
+        current = self._snapshots.get(key)
+        if current is not None and current.version != version:
+            return current
+        event = self._changed.get(key)
+        if event is None:
+            event = self._changed[key] = asyncio.Event()
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._snapshots.get(key)
+
+
+async def _until_closed(ws):
+    # Incoming messages are ignored; recv raises once the client goes away
+    while True:
+        await ws.recv()
+
+
+async def push_snapshots(ws, key: str, keep_alive: Callable[[], Awaitable[Any]]):
+    """Send key's snapshot over a websocket now and after every change.
+
+    keep_alive is awaited between waits so the producer keeps refreshing
+    the subscribed data while the socket is open. Returns when the client
+    disconnects.
+    """
+    closed = asyncio.ensure_future(_until_closed(ws))
+    version = None
+    try:
+        while not closed.done():
+            await keep_alive()
+            # Nothing live for this key yet is sent too, rather than silence
+            snapshot_hub.ensure(key)
+            waiter = asyncio.ensure_future(
+                snapshot_hub.wait(key, version, PUSH_RETRACK_INTERVAL)
+            )
+            await asyncio.wait({waiter, closed}, return_when=asyncio.FIRST_COMPLETED)
+            if not waiter.done():
+                waiter.cancel()
+                break
+            snapshot = waiter.result()
+            if snapshot is not None and snapshot.version != version:
+                version = snapshot.version
+                await ws.send(snapshot.message.decode())
+    finally:
+        closed.cancel()
+
+
+async def long_poll(request: Request, key: str) -> HTTPResponse:
+    """Hold a request until key moves past ?version= or ?timeout= passes.
+
+    Responds with the snapshot message either way; its version is also in
+    the X-Data-Version header for the device's next call.
+    """
+    try:
+        version = int(request.args.get("version"))
+    except (TypeError, ValueError):
+        version = None
+    try:
+        timeout = float(request.args.get("timeout", LONG_POLL_TIMEOUT))
+    except ValueError:
+        timeout = LONG_POLL_TIMEOUT
+    timeout = min(max(timeout, 0), LONG_POLL_MAX_TIMEOUT)
+
+    snapshot_hub.ensure(key)
+    snapshot = await snapshot_hub.wait(key, version, timeout)
+    return response.raw(
+        snapshot.message,
+        content_type="application/json",
+        headers={"X-Data-Version": str(snapshot.version)},
+    )
+
+
+# Global snapshot hub instance
+snapshot_hub = SnapshotHub()
+config_manager.add_mode_listener(snapshot_hub.restamp)
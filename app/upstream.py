@@ -0,0 +1,158 @@
+import asyncio
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from . import serialization
+from .cache import response_cache
+from .selection import Selection
+from .constants import (
+    UPSTREAM_CONNECT_TIMEOUT,
+    UPSTREAM_KEEPALIVE_EXPIRY,
+    UPSTREAM_MAX_CONNECTIONS,
+    UPSTREAM_MAX_CONNECTIONS_PER_HOST,
+    UPSTREAM_TIMEOUT,
+    CacheTier,
+)
+
+
+class UpstreamClient:
+    """Shared async HTTP client used by every sport fetcher.
+
+    One pooled keep-alive client is created lazily on the running loop and
+    reused for NASCAR and MLB calls. Each host additionally gets its own
+    semaphore so a slow upstream can't take every pooled connection.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = UPSTREAM_MAX_CONNECTIONS,
+        max_connections_per_host: int = UPSTREAM_MAX_CONNECTIONS_PER_HOST,
+        timeout: float = UPSTREAM_TIMEOUT,
+        connect_timeout: float = UPSTREAM_CONNECT_TIMEOUT,
+    ):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return self._client
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.max_connections_per_host)
+            self._host_slots[host] = slot
+        return slot
+
+    async def get(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """GET a URL through the shared pool"""
+        async with self._host_slot(url):
+            return await self._get_client().get(url, headers=headers)
+
+    async def get_json(
+        self,
+        url: str,
+        tier: Optional[CacheTier] = None,
+        select: Optional[Selection] = None,
+    ) -> Any:
+        """GET a URL and return its parsed JSON body, raising on HTTP errors.
+
+        With a tier, a fresh copy in the response cache is returned without
+        touching the network and new results are cached under that tier. A
+        stale copy is revalidated with If-None-Match / If-Modified-Since; on
+        304 Not Modified the existing parsed value is reused as-is.
+
+        Concurrent calls for the same URL are coalesced: the first caller
+        starts the request and everyone else awaits that same in-flight
+        fetch, sharing its parsed result. Callers must treat the result as
+        read-only.
+
+        With a selection, the body is parsed as it streams in and only the
+        selected sub-trees are built; results are cached and coalesced per
+        URL and selection.
+        """
+        key = url if select is None else f"{url}#{select.key}"
+        if tier is not None:
+            cached = response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_json(url, key, tier, select))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield the shared fetch so one cancelled caller can't abort it
+        return await asyncio.shield(pending)
+
+    async def _fetch_json(
+        self,
+        url: str,
+        key: str,
+        tier: Optional[CacheTier],
+        select: Optional[Selection],
+    ) -> Any:
+        stale = response_cache.peek(key) if tier is not None else None
+        headers = {}
+        if stale is not None:
+            if stale.etag:
+                headers["If-None-Match"] = stale.etag
+            if stale.last_modified:
+                headers["If-Modified-Since"] = stale.last_modified
+
+        if select is None:
+            res = await self.get(url, headers=headers or None)
+            if res.status_code == 304 and stale is not None:
+                data = stale.value
+            else:
+                res.raise_for_status()
+                data = serialization.loads(res.content)
+        else:
+            async with self._host_slot(url):
+                async with self._get_client().stream(
+                    "GET", url, headers=headers or None
+                ) as res:
+                    if res.status_code == 304 and stale is not None:
+                        data = stale.value
+                    else:
+                        res.raise_for_status()
+                        data = await select.parse_stream(res.aiter_bytes())
+
+        if tier is not None:
+            etag = res.headers.get("ETag")
+            last_modified = res.headers.get("Last-Modified")
+            if res.status_code == 304 and stale is not None:
+                # A 304 may omit the validators; keep the ones we sent
+                etag = etag or stale.etag
+                last_modified = last_modified or stale.last_modified
+            response_cache.set(key, data, tier, etag=etag, last_modified=last_modified)
+        return data
+
+    async def close(self):
+        """Close pooled connections (called when the server stops)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._host_slots.clear()
+        self._inflight.clear()
+
+
+# Global upstream client instance
+upstream = UpstreamClient()
@@ -0,0 +1,159 @@
+"""Encode/decode timings for each installed JSON backend.
+
+Run from the repository root:
+
+    python -m benchmarks.json_backends [recorded.json ...]
+
+Uses the recorded NASCAR schedule and MLB team list in the tree, any extra
+recorded payloads given on the command line, and synthetic MLB feed/live and
+NASCAR live-feed documents shaped like the real ones (nothing recorded from
+a live game is checked in).
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+from app.constants import JsonBackend
+from app.serialization import JsonSerializer, get_serializer
+
+ROOT = Path(__file__).resolve().parent.parent
+RECORDED = [ROOT / "data" / "schedule.json", ROOT / "app" / "data" / "mlb_teams.json"]
+
+
+def synthetic_mlb_feed(innings: int = 9, plays_per_half: int = 5) -> dict:
+    """A feed/live document about the size of a finished nine-inning game"""
+    plays = []
+    for index in range(innings * 2 * plays_per_half):
+        events = [
+            {
+                "type": "pitch",
+                "isPitch": True,
+                "details": {
+                    "description": "Called Strike",
+                    "type": {"code": "FF", "description": "Four-Seam Fastball"},
+                    "isStrike": True,
+                },
+                "count": {"balls": 1, "strikes": pitch % 3, "outs": 1},
+                "pitchData": {
+                    "startSpeed": 94.1,
+                    "endSpeed": 86.3,
+                    "strikeZoneTop": 3.4,
+                    "strikeZoneBottom": 1.6,
+                    "coordinates": {"pX": 0.12, "pZ": 2.5, "x": 112.3, "y": 170.2},
+                    "breaks": {"spinRate": 2301, "spinDirection": 210},
+                },
+                "playId": f"{index:04d}-{pitch}",
+            }
+            for pitch in range(5)
+        ]
+        plays.append(
+            {
+                "result": {
+                    "type": "atBat",
+                    "event": "Single",
+                    "eventType": "single",
+                    "description": "Batter singles on a line drive to left field.",
+                    "awayScore": 2,
+                    "homeScore": 3,
+                },
+                "about": {
+                    "atBatIndex": index,
+                    "halfInning": "top" if index % 2 else "bottom",
+                    "isTopInning": bool(index % 2),
+                    "inning": index // (2 * plays_per_half) + 1,
+                    "isComplete": True,
+                },
+                "count": {"balls": 1, "strikes": 2, "outs": 1},
+                "matchup": {
+                    "batter": {"id": 600000 + index % 18, "fullName": "Batter Name"},
+                    "pitcher": {"id": 500000 + index % 4, "fullName": "Pitcher Name"},
+                    "batSide": {"code": "R", "description": "Right"},
+                    "pitchHand": {"code": "R", "description": "Right"},
+                },
+                "runners": [{"movement": {"start": None, "end": "1B"}}],
+                "playEvents": events,
+            }
+        )
+    team = {"id": 119, "name": "Los Angeles Dodgers", "abbreviation": "LAD"}
+    return {
+        "metaData": {"timeStamp": "20250601_000000"},
+        "gameData": {
+            "status": {"abstractGameState": "Live"},
+            "teams": {"home": team, "away": dict(team, id=137)},
+        },
+        "liveData": {
+            "plays": {"allPlays": plays},
+            "linescore": {"teams": {"home": {"runs": 3}, "away": {"runs": 2}}},
+        },
+    }
+
+
+def synthetic_nascar_live_feed(vehicles: int = 40) -> dict:
+    """A live-feed.json document for a full field of cars"""
+    return {
+        "lap_number": 120,
+        "elapsed_time": 5400,
+        "flag_state": 1,
+        "race_id": 5543,
+        "run_name": "Race",
+        "time_of_day_os": "2025-06-01T14:00:00.000",
+        "vehicles": [
+            {
+                "running_position": position + 1,
+                "vehicle_number": str(position + 1),
+                "laps_completed": 120,
+                "last_lap_time": 31.456,
+                "last_lap_speed": 171.2,
+                "driver": {
+                    "first_name": "First",
+                    "last_name": "Last",
+                    "full_name": "First Last",
+                },
+                "laps_led": [{"start_lap": 1, "end_lap": 10}],
+                "pit_stops": [{"pit_in_lap_count": 60, "pit_stop_duration": 12.1}],
+            }
+            for position in range(vehicles)
+        ],
+    }
+
+
+def payloads(paths):
+    for path in paths:
+        yield path.name, path.read_bytes()
+    stdlib = JsonSerializer()
+    yield "mlb feed/live (synthetic)", stdlib.dumps(synthetic_mlb_feed())
+    yield "nascar live-feed (synthetic)", stdlib.dumps(synthetic_nascar_live_feed())
+
+
+def best_of(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main(argv):
+    serializers = {JsonBackend.STDLIB: JsonSerializer()}
+    for backend in (JsonBackend.ORJSON, JsonBackend.MSGSPEC):
+        serializer = get_serializer(backend.value)
+        if serializer.backend == backend:
+            serializers[backend] = serializer
+
+    paths = RECORDED + [Path(arg) for arg in argv]
+    for name, body in payloads(paths):
+        obj = serializers[JsonBackend.STDLIB].loads(body)
+        number = max(1, 2_000_000 // len(body))
+        print(f"\n{name} ({len(body) / 1024:.1f} KiB)")
+        base = None
+        for backend, serializer in serializers.items():
+            decode = best_of(lambda: serializer.loads(body), number)
+            encode = best_of(lambda: serializer.dumps(obj), number)
+            if base is None:
+                base = (decode, encode)
+            print(
+                f"  {backend.value:8} decode {decode * 1e6:9.1f} us"
+                f" ({base[0] / decode:4.1f}x)"
+                f"  encode {encode * 1e6:9.1f} us ({base[1] / encode:4.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
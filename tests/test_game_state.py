@@ -0,0 +1,289 @@
+import asyncio
+import copy
+
+import pytest
+
+from app.baseball import game_state
+from app.baseball.game_state import (
+    FEED_SELECTION,
+    LiveGameState,
+    PatchError,
+    apply_patch,
+    select_patch,
+)
+
+PLAYS = "/liveData/plays/allPlays"
+
+
+def pitch(description, pitch_data=True):
+    event = {"type": "pitch", "details": {"description": description}}
+    if pitch_data:
+        event["pitchData"] = {"startSpeed": 95.0}
+    return event
+
+
+def play(batter_id, events, complete=False, event_type=""):
+    return {
+        "about": {"isComplete": complete, "inning": 1, "isTopInning": True},
+        "matchup": {"batter": {"id": batter_id}, "pitcher": {"id": 1}},
+        "result": {"eventType": event_type, "event": event_type.title()},
+        "playEvents": events,
+    }
+
+
+def make_feed():
+    return {
+        "metaData": {"timeStamp": "20250601_200000"},
+        "gameData": {"status": {"abstractGameState": "Live"}},
+        "liveData": {
+            "plays": {
+                "allPlays": [
+                    play(10, [pitch("Ball"), pitch("In play")], True, "single"),
+                    play(11, [pitch("Ball"), pitch("Swing Strk", pitch_data=False)]),
+                ]
+            }
+        },
+    }
+
+
+def descriptions(state):
+    state.cursor.advance(state.feed["liveData"]["plays"]["allPlays"])
+    return state.cursor.latest_pitch["details"]["description"]
+
+
+class FakeUpstream:
+    """Serves queued responses for the full feed and diffPatch URLs"""
+
+    def __init__(self, full, diffs=()):
+        self.full = full
+        self.diffs = list(diffs)
+        self.full_loads = 0
+
+    async def get_json(self, url, tier=None, select=None):
+        if "diffPatch" in url:
+            return self.diffs.pop(0)
+        self.full_loads += 1
+        return copy.deepcopy(self.full)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    def install(full, diffs=()):
+        fake = FakeUpstream(full, diffs)
+        monkeypatch.setattr(game_state, "upstream", fake)
+        return fake
+
+    return install
+
+
+def refresh(state):
+    state.refreshed_at = 0  # Skip the live TTL so every call hits upstream
+    return asyncio.run(state.refresh())
+
+
+def test_add_inserts_into_arrays_by_index_and_dash():
+    doc = {"items": [1, 3]}
+    apply_patch(
+        doc,
+        [
+            {"op": "add", "path": "/items/1", "value": 2},
+            {"op": "add", "path": "/items/-", "value": 4},
+        ],
+    )
+    assert doc == {"items": [1, 2, 3, 4]}
+
+
+def test_root_replace_returns_the_new_document():
+    doc = {"a": 1}
+    patched = apply_patch(doc, [{"op": "replace", "path": "", "value": {"b": 2}}])
+    assert patched == {"b": 2}
+    assert doc == {"a": 1}
+
+
+@pytest.mark.parametrize(
+    "op",
+    [
+        {"op": "replace", "path": "/missing/key", "value": 1},
+        {"op": "remove", "path": "/items/5"},
+        {"op": "test", "path": "/items/0", "value": 2},
+        {"op": "add", "path": "no-slash", "value": 1},
+    ],
+)
+def test_operations_that_do_not_fit_raise(op):
+    with pytest.raises(PatchError):
+        apply_patch({"items": [1]}, [op])
+
+
+def test_select_patch_drops_ops_outside_and_trims_ops_above():
+    ops = select_patch(
+        FEED_SELECTION,
+        [
+            {"op": "replace", "path": "/gameData/venue", "value": {"id": 1}},
+            {
+                "op": "add",
+                "path": "/gameData/teams",
+                "value": {"home": {"id": 119, "name": "Dodgers", "venue": {}}},
+            },
+        ],
+    )
+    assert ops == [
+        {
+            "op": "add",
+            "path": "/gameData/teams",
+            "value": {"home": {"id": 119, "name": "Dodgers"}},
+        }
+    ]
+
+
+def test_select_patch_keeps_moves_inside_the_selection():
+    op = {
+        "op": "move",
+        "from": f"{PLAYS}/1/playEvents/0",
+        "path": f"{PLAYS}/0/playEvents/-",
+    }
+    assert select_patch(FEED_SELECTION, [op]) == [op]
+
+
+@pytest.mark.parametrize("kind", ["move", "copy"])
+def test_select_patch_rejects_moves_across_the_selection(kind):
+    into = {"op": kind, "from": "/gameData/venue", "path": "/gameData/status"}
+    out_of = {"op": kind, "from": "/gameData/status", "path": "/gameData/venue"}
+    for op in (into, out_of):
+        with pytest.raises(PatchError):
+            select_patch(FEED_SELECTION, [op])
+
+
+def test_diff_patches_update_the_latest_pitch(upstream):
+    diffs = [
+        [
+            {
+                "diff": [
+                    {
+                        "op": "add",
+                        "path": f"{PLAYS}/1/playEvents/1/pitchData",
+                        "value": {},
+                    }
+                ]
+            }
+        ],
+        [
+            {
+                "diff": [
+                    {
+                        "op": "replace",
+                        "path": f"{PLAYS}/1/playEvents/0",
+                        "value": pitch("Foul"),
+                    }
+                ]
+            }
+        ],
+        [{"diff": [{"op": "remove", "path": f"{PLAYS}/1/playEvents/1"}]}],
+    ]
+    upstream(make_feed(), diffs)
+    state = LiveGameState(1)
+    refresh(state)
+    assert descriptions(state) == "Ball"
+    refresh(state)
+    assert descriptions(state) == "Swing Strk"
+    refresh(state)
+    assert descriptions(state) == "Swing Strk"
+    refresh(state)
+    assert descriptions(state) == "Foul"
+    assert state.cursor.batter_line(10) == "1-for-1, single"
+
+
+def test_failed_patch_falls_back_to_a_full_reload(upstream):
+    bad = [{"diff": [{"op": "replace", "path": f"{PLAYS}/9/result", "value": {}}]}]
+    fake = upstream(make_feed(), [bad])
+    state = LiveGameState(1)
+    refresh(state)
+    first = state.feed
+    descriptions(state)
+
+    refresh(state)
+    assert fake.full_loads == 2
+    assert state.feed is not first
+    assert state.feed == make_feed()
+    assert descriptions(state) == "Ball"
+    assert state.cursor.batter_line(10) == "1-for-1, single"
+
+
+def test_root_replace_resets_the_cursor(upstream):
+    replaced = make_feed()
+    replaced["liveData"]["plays"]["allPlays"][1]["playEvents"] = [pitch("Foul")]
+    upstream(
+        make_feed(), [[{"diff": [{"op": "replace", "path": "", "value": replaced}]}]]
+    )
+    state = LiveGameState(1)
+    refresh(state)
+    descriptions(state)
+
+    refresh(state)
+    assert state.feed == replaced
+    assert descriptions(state) == "Foul"
+    assert state.cursor.batter_line(10) == "1-for-1, single"
+
+
+def test_full_feed_diff_response_is_projected(upstream):
+    full = make_feed()
+    full["gameData"]["venue"] = {"id": 1}
+    full["liveData"]["plays"]["allPlays"][1]["playEvents"].append(pitch("Foul"))
+    upstream(make_feed(), [full])
+    state = LiveGameState(1)
+    refresh(state)
+    descriptions(state)
+
+    refresh(state)
+    assert "venue" not in state.feed["gameData"]
+    assert descriptions(state) == "Foul"
+
+
+def test_selected_patch_matches_projecting_the_patched_full_feed():
+    full = make_feed()
+    full["liveData"]["plays"]["allPlays"][1]["playEvents"][0]["index"] = 0
+    full["gameData"]["venue"] = {"id": 1}
+    ops = [
+        {
+            "op": "move",
+            "from": f"{PLAYS}/1/playEvents/0",
+            "path": f"{PLAYS}/0/playEvents/-",
+        },
+        {
+            "op": "copy",
+            "from": f"{PLAYS}/0/playEvents/0",
+            "path": f"{PLAYS}/1/playEvents/0",
+        },
+        {"op": "add", "path": f"{PLAYS}/-", "value": play(12, [pitch("Foul")])},
+        {"op": "replace", "path": "/gameData/venue/id", "value": 2},
+    ]
+    trimmed = FEED_SELECTION.project(copy.deepcopy(full))
+    trimmed = apply_patch(trimmed, select_patch(FEED_SELECTION, copy.deepcopy(ops)))
+    assert trimmed == FEED_SELECTION.project(apply_patch(full, ops))
+
+
+def test_concurrent_games_keep_their_state_between_refreshes(monkeypatch):
+    full_loads = {}
+
+    class TwoGames:
+        async def get_json(self, url, tier=None, select=None):
+            await asyncio.sleep(0)  # Let the other game's refresh interleave
+            if "diffPatch" in url:
+                return []
+            game_pk = int(url.split("/game/")[1].split("/")[0])
+            full_loads[game_pk] = full_loads.get(game_pk, 0) + 1
+            return make_feed()
+
+    monkeypatch.setattr(game_state, "upstream", TwoGames())
+    monkeypatch.setattr(game_state, "_game_states", {})
+
+    async def poll(game_pk):
+        state = game_state.get_game_state(game_pk)
+        state.refreshed_at = 0
+        await state.refresh()
+
+    async def cycles():
+        for _ in range(5):
+            await asyncio.gather(poll(1), poll(2))
+
+    asyncio.run(cycles())
+    assert full_loads == {1: 1, 2: 1}
@@ -0,0 +1,37 @@
+import asyncio
+
+from app.baseball import season
+from app.baseball.season import TeamSeason
+from app.constants import CacheTier
+
+SCHEDULE = {
+    "dates": [
+        {"date": "2025-06-02", "games": [{"gamePk": 2}]},
+        {"date": "2025-06-01", "games": [{"gamePk": 1}]},
+    ]
+}
+
+
+class FakeUpstream:
+    """Hands back the same parsed payload, as a 304 revalidation does"""
+
+    def __init__(self):
+        self.tiers = []
+
+    async def get_json(self, url, tier=None, select=None):
+        self.tiers.append(tier)
+        return SCHEDULE
+
+
+def test_unchanged_season_reload_keeps_the_index(monkeypatch):
+    fake = FakeUpstream()
+    monkeypatch.setattr(season, "upstream", fake)
+    team = TeamSeason(119, 2025)
+
+    asyncio.run(team._load_season())
+    assert team.dates == ["2025-06-01", "2025-06-02"]
+    team.games[1] = {"gamePk": 2, "refreshed": True}  # As _refresh_days would
+
+    asyncio.run(team._load_season())
+    assert fake.tiers == [CacheTier.STATIC, CacheTier.STATIC]
+    assert team.games[1] == {"gamePk": 2, "refreshed": True}
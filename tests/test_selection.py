@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+import pytest
+
+from app import selection
+from app.baseball.game_state import FEED_SELECTION
+from app.nascar.live_data import LIVE_FEED_SELECTION
+from app.selection import Selection, _SelectiveBuilder, pointer_prefix
+from benchmarks.json_backends import synthetic_mlb_feed, synthetic_nascar_live_feed
+
+ijson = pytest.importorskip("ijson")
+
+DOC = {
+    "meta": {"id": 7, "tags": ["a", "b"]},
+    "rows": [
+        {"id": 1, "name": "one", "extra": {"deep": [1, 2]}},
+        {"id": 2, "name": "two", "extra": None},
+    ],
+    "matrix": [[1, 2], [3]],
+    "skipped": {"big": list(range(50))},
+    "empty": {},
+    "flag": False,
+}
+
+
+def chunked(body, size):
+    async def chunks():
+        yield b""  # Empty chunks must not read as end of stream
+        for i in range(0, len(body), size):
+            yield body[i : i + size]
+
+    return chunks()
+
+
+def build(sel, doc):
+    builder = _SelectiveBuilder(sel)
+    for prefix, event, value in ijson.parse(json.dumps(doc).encode(), use_float=True):
+        builder.event(prefix, event, value)
+    return builder.root
+
+
+@pytest.mark.parametrize(
+    "paths",
+    [
+        ["meta.id"],
+        ["meta.tags", "rows.item.name"],
+        ["rows.item.extra.deep"],
+        ["matrix.item.item", "empty", "flag"],
+        ["missing.path"],
+        [""],
+    ],
+)
+def test_builder_matches_projecting_the_parsed_document(paths):
+    sel = Selection(paths)
+    assert build(sel, DOC) == sel.project(DOC)
+
+
+def test_project_keeps_ancestors_as_bare_containers():
+    sel = Selection(["rows.item.name", "meta.tags"])
+    assert sel.project(DOC) == {
+        "meta": {"tags": ["a", "b"]},
+        "rows": [{"name": "one"}, {"name": "two"}],
+    }
+
+
+@pytest.mark.parametrize(
+    "sel, doc",
+    [
+        (FEED_SELECTION, synthetic_mlb_feed(2, 3)),
+        (LIVE_FEED_SELECTION, synthetic_nascar_live_feed(5)),
+    ],
+)
+def test_builder_matches_project_on_upstream_feeds(sel, doc):
+    assert build(sel, doc) == sel.project(doc)
+
+
+@pytest.mark.parametrize("threshold", [0, 64, 1 << 30])
+def test_parse_stream_gives_the_same_result_either_side_of_the_threshold(
+    monkeypatch, threshold
+):
+    monkeypatch.setattr(selection, "STREAM_PARSE_THRESHOLD", threshold)
+    sel = Selection(["meta", "rows.item.id", "matrix.item.item"])
+    body = json.dumps(DOC).encode()
+    for size in (1, 7, len(body)):
+        parsed = asyncio.run(sel.parse_stream(chunked(body, size)))
+        assert parsed == sel.project(DOC)
+
+
+def test_small_bodies_skip_the_event_stream(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("streamed a body under the threshold")
+
+    monkeypatch.setattr(selection.ijson, "parse_async", fail)
+    sel = Selection(["meta.id"])
+    body = json.dumps(DOC).encode()
+    assert asyncio.run(sel.parse_stream(chunked(body, 16))) == {"meta": {"id": 7}}
+
+
+@pytest.mark.parametrize(
+    "path, prefix",
+    [
+        ("", ""),
+        (
+            "/liveData/plays/allPlays/3/playEvents/-",
+            "liveData.plays.allPlays.item.playEvents.item",
+        ),
+        ("/a~1b/c~0d", "a/b.c~d"),
+        ("relative", None),
+    ],
+)
+def test_pointer_prefix(path, prefix):
+    assert pointer_prefix(path) == prefix